@@ -9,13 +9,23 @@ class Config:
     SECRET_KEY = os.getenv("EIRESCOPE_SECRET_KEY", "eirescope-dev-key-change-in-production")
     DATABASE_URL = os.getenv("EIRESCOPE_DB_URL", f"sqlite:///{os.path.join(DATA_DIR, 'investigations.db')}")
     PLUGIN_DIR = os.path.join(BASE_DIR, "eirescope", "modules")
-    CACHE_DIR = os.path.join(DATA_DIR, "cache")
+    CACHE_DIR = os.getenv("EIRESCOPE_CACHE_DIR", os.path.join(DATA_DIR, "cache"))
     LOG_LEVEL = os.getenv("EIRESCOPE_LOG_LEVEL", "INFO")
     MAX_CONCURRENT_MODULES = int(os.getenv("EIRESCOPE_MAX_CONCURRENT", "5"))
     REQUEST_TIMEOUT = int(os.getenv("EIRESCOPE_REQUEST_TIMEOUT", "10"))
     MAX_RETRIES = int(os.getenv("EIRESCOPE_MAX_RETRIES", "3"))
     RATE_LIMIT_DELAY = float(os.getenv("EIRESCOPE_RATE_LIMIT", "0.5"))
     CACHE_TTL = int(os.getenv("EIRESCOPE_CACHE_TTL", "86400"))  # 24 hours
+    IP_GEO_CACHE_TTL = int(os.getenv("EIRESCOPE_IP_GEO_CACHE_TTL", "43200"))  # 12 hours
+    IP_RDNS_CACHE_TTL = int(os.getenv("EIRESCOPE_IP_RDNS_CACHE_TTL", "900"))  # 15 minutes
+    IP_WHOIS_CACHE_TTL = int(os.getenv("EIRESCOPE_IP_WHOIS_CACHE_TTL", "86400"))  # 24 hours
+    USERNAME_CACHE_TTL = int(os.getenv("EIRESCOPE_USERNAME_CACHE_TTL", "300"))  # 5 minutes
+    USERNAME_MAX_WORKERS = int(os.getenv("EIRESCOPE_USERNAME_MAX_WORKERS", "64"))
+
+    @classmethod
+    def as_dict(cls) -> dict:
+        """Settings as the plain dict the engine and its modules read."""
+        return {key: getattr(cls, key) for key in dir(cls) if key.isupper()}
 
 class ProductionConfig(Config):
     DEBUG = False
@@ -1,8 +1,9 @@
 """Investigation Engine — orchestrates OSINT modules and aggregates results."""
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional, Dict
 from datetime import datetime
-from eirescope.core.entity import Entity, EntityType, Investigation
+from eirescope.core.entity import Entity, Investigation, ENTITY_TYPE_BY_VALUE
 from eirescope.core.plugin_manager import PluginManager
 from eirescope.utils.validators import EntityValidator
 from eirescope.utils.exceptions import ValidationError, ModuleError
@@ -31,9 +32,8 @@ class InvestigationEngine:
         """
         # 1. Validate and detect entity type
         if entity_type:
-            try:
-                etype = EntityType(entity_type)
-            except ValueError:
+            etype = ENTITY_TYPE_BY_VALUE.get(entity_type)
+            if etype is None:
                 raise ValidationError(f"Unknown entity type: {entity_type}")
         else:
             etype = EntityValidator.detect_type(query)
@@ -48,7 +48,7 @@ class InvestigationEngine:
         if not is_valid:
             raise ValidationError(f"Invalid {etype.value}: {query}")
 
-        logger.info(f"Starting investigation: {normalized} (type: {etype.value})")
+        logger.info("Starting investigation: %s (type: %s)", normalized, etype.value)
 
         # 3. Create investigation
         investigation = Investigation(
@@ -69,29 +69,39 @@ class InvestigationEngine:
         # 5. Get applicable modules
         modules = self.plugin_manager.get_modules_for_entity(etype)
         if module_filter:
-            modules = [m for m in modules if m.name in module_filter]
+            wanted = frozenset(module_filter)
+            modules = [m for m in modules if m.name in wanted]
 
         if not modules:
-            logger.warning(f"No modules available for entity type: {etype.value}")
+            logger.warning("No modules available for entity type: %s", etype.value)
             investigation.complete()
             return investigation
 
-        # 6. Execute each module sequentially
-        for module in modules:
-            try:
-                logger.info(f"Running module: {module.name}")
-                new_entities = module.execute(seed_entity, investigation)
-                investigation.modules_run.append(module.name)
-                logger.info(f"Module {module.name} found {len(new_entities)} entities")
-            except Exception as e:
-                logger.error(f"Module {module.name} failed: {e}")
-                investigation.modules_run.append(f"{module.name} (FAILED)")
+        # 6. Execute modules concurrently — they are I/O-bound, so wall-clock
+        #    time approaches the slowest module rather than the sum of all.
+        max_workers = self.config.get("MAX_CONCURRENT_MODULES", 5)
+        get_executor = self.plugin_manager.get_executor
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for module in modules:
+                logger.info("Running module: %s", module.name)
+                execute = get_executor(module.name) or module.execute
+                futures[executor.submit(execute, seed_entity, investigation)] = module
+            for future in as_completed(futures):
+                module = futures[future]
+                try:
+                    new_entities = future.result()
+                    investigation.modules_run.append(module.name)
+                    logger.info("Module %s found %d entities", module.name, len(new_entities))
+                except Exception as e:
+                    logger.error("Module %s failed: %s", module.name, e)
+                    investigation.modules_run.append(f"{module.name} (FAILED)")
 
         # 7. Complete investigation
         investigation.complete()
         logger.info(
-            f"Investigation complete: {len(investigation.entities)} entities, "
-            f"{len(investigation.relationships)} relationships"
+            "Investigation complete: %d entities, %d relationships",
+            len(investigation.entities), len(investigation.relationships),
         )
         return investigation
 
@@ -1,9 +1,10 @@
 """Core data models for EireScope investigations."""
+import time
 import uuid
+import threading
 from enum import Enum
-from datetime import datetime
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 
 
 class EntityType(Enum):
@@ -25,6 +26,25 @@ class EntityType(Enum):
     CARRIER_INFO = "carrier_info"
 
 
+_iso_second = (0, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO 8601, formatting the date/time part once per second."""
+    global _iso_second
+    now = time.time()
+    sec = int(now)
+    cached_sec, prefix = _iso_second
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_second = (sec, prefix)
+    return f"{prefix}.{int((now - sec) * 1_000_000):06d}"
+
+
+# Value -> member lookup; plain dict access skips Enum.__call__ when rehydrating entities
+ENTITY_TYPE_BY_VALUE: Dict[str, EntityType] = {t.value: t for t in EntityType}
+
+
 @dataclass
 class Entity:
     """Represents a single OSINT artifact discovered during investigation."""
@@ -34,29 +54,33 @@ class Entity:
     confidence: float = 1.0
     metadata: Dict[str, Any] = field(default_factory=dict)
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_now_iso)
+    # Built on first to_dict(); holds `metadata` by reference so in-place updates show through
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict:
-        return {
-            "id": self.id,
-            "entity_type": self.entity_type.value,
-            "value": self.value,
-            "source_module": self.source_module,
-            "confidence": self.confidence,
-            "metadata": self.metadata,
-            "created_at": self.created_at,
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "id": self.id,
+                "entity_type": self.entity_type.value,
+                "value": self.value,
+                "source_module": self.source_module,
+                "confidence": self.confidence,
+                "metadata": self.metadata,
+                "created_at": self.created_at,
+            }
+        return self._dict_cache
 
     @classmethod
     def from_dict(cls, data: Dict) -> "Entity":
         return cls(
             id=data.get("id", str(uuid.uuid4())),
-            entity_type=EntityType(data["entity_type"]),
+            entity_type=ENTITY_TYPE_BY_VALUE[data["entity_type"]],
             value=data["value"],
             source_module=data.get("source_module", ""),
             confidence=data.get("confidence", 1.0),
             metadata=data.get("metadata", {}),
-            created_at=data.get("created_at", datetime.utcnow().isoformat()),
+            created_at=data.get("created_at", _now_iso()),
         )
 
 
@@ -69,16 +93,30 @@ class EntityRelationship:
     confidence: float = 1.0
     evidence: Dict[str, Any] = field(default_factory=dict)
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict:
-        return {
-            "id": self.id,
-            "source_entity_id": self.source_entity_id,
-            "target_entity_id": self.target_entity_id,
-            "relationship_type": self.relationship_type,
-            "confidence": self.confidence,
-            "evidence": self.evidence,
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "id": self.id,
+                "source_entity_id": self.source_entity_id,
+                "target_entity_id": self.target_entity_id,
+                "relationship_type": self.relationship_type,
+                "confidence": self.confidence,
+                "evidence": self.evidence,
+            }
+        return self._dict_cache
+
+
+def _make_relationship(source_id: str, target_id: str, rel_type: str,
+                       confidence: float = 1.0, evidence: Dict = None) -> EntityRelationship:
+    return EntityRelationship(
+        source_entity_id=source_id,
+        target_entity_id=target_id,
+        relationship_type=rel_type,
+        confidence=confidence,
+        evidence=evidence or {},
+    )
 
 
 @dataclass
@@ -92,39 +130,90 @@ class Investigation:
     status: str = "pending"  # pending, running, completed, failed
     notes: str = ""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_now_iso)
     completed_at: Optional[str] = None
+    # Modules run concurrently and share the investigation, so mutations are serialized
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False,
+                                  repr=False, compare=False)
+    # Lookup indexes over `entities`, keyed by (type, value) and by id
+    _index: Dict[Tuple[EntityType, str], Entity] = field(default_factory=dict, init=False,
+                                                         repr=False, compare=False)
+    _by_id: Dict[str, Entity] = field(default_factory=dict, init=False,
+                                      repr=False, compare=False)
+    # Column-wise copy of the graph node fields, parallel to `entities`
+    _ids: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _values: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _types: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _confs: List[float] = field(default_factory=list, init=False, repr=False, compare=False)
+    _sources: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for entity in self.entities:
+            self._index.setdefault((entity.entity_type, entity.value), entity)
+            self._by_id[entity.id] = entity
+            self._append_columns(entity)
+
+    def _append_columns(self, entity: Entity):
+        self._ids.append(entity.id)
+        self._values.append(entity.value)
+        self._types.append(entity.entity_type.value)
+        self._confs.append(entity.confidence)
+        self._sources.append(entity.source_module)
 
     def add_entity(self, entity: Entity) -> Entity:
         """Add entity, deduplicating by type+value."""
-        for existing in self.entities:
-            if existing.entity_type == entity.entity_type and existing.value == entity.value:
-                existing.metadata.update(entity.metadata)
-                return existing
+        with self._lock:
+            return self._add_entity_locked(entity)
+
+    def add_entities(self, entities: List[Entity]) -> List[Entity]:
+        """Add several entities under one lock acquisition.
+
+        Returns the stored instance for each input, in order (an existing
+        entity when the type+value was already known).
+        """
+        with self._lock:
+            return [self._add_entity_locked(e) for e in entities]
+
+    def _add_entity_locked(self, entity: Entity) -> Entity:
+        key = (entity.entity_type, entity.value)
+        existing = self._index.get(key)
+        if existing is not None:
+            existing.metadata.update(entity.metadata)
+            existing._dict_cache = None
+            return existing
+        self._index[key] = entity
+        self._by_id[entity.id] = entity
         self.entities.append(entity)
+        self._append_columns(entity)
         return entity
 
     def add_relationship(self, source_id: str, target_id: str,
                          rel_type: str, confidence: float = 1.0,
                          evidence: Dict = None) -> EntityRelationship:
         """Add a relationship between two entities."""
-        rel = EntityRelationship(
-            source_entity_id=source_id,
-            target_entity_id=target_id,
-            relationship_type=rel_type,
-            confidence=confidence,
-            evidence=evidence or {},
-        )
-        self.relationships.append(rel)
+        rel = _make_relationship(source_id, target_id, rel_type, confidence, evidence)
+        with self._lock:
+            self.relationships.append(rel)
         return rel
 
+    def add_relationships(self, rels: List[Tuple]) -> List[EntityRelationship]:
+        """Add several relationships at once.
+
+        Each item is a tuple of add_relationship() arguments:
+        (source_id, target_id, rel_type[, confidence[, evidence]]).
+        """
+        created = [_make_relationship(*args) for args in rels]
+        with self._lock:
+            self.relationships.extend(created)
+        return created
+
     def complete(self):
         self.status = "completed"
-        self.completed_at = datetime.utcnow().isoformat()
+        self.completed_at = _now_iso()
 
     def fail(self, reason: str = ""):
         self.status = "failed"
-        self.completed_at = datetime.utcnow().isoformat()
+        self.completed_at = _now_iso()
         self.notes = reason
 
     def to_dict(self) -> Dict:
@@ -143,11 +232,12 @@ class Investigation:
             "relationship_count": len(self.relationships),
         }
 
+    def node_columns(self) -> Tuple[List[str], List[str], List[str], List[float], List[str]]:
+        """Entity ids, values, type values, confidences and sources as parallel lists."""
+        return self._ids, self._values, self._types, self._confs, self._sources
+
     def get_entities_by_type(self, entity_type: EntityType) -> List[Entity]:
         return [e for e in self.entities if e.entity_type == entity_type]
 
     def get_entity_by_id(self, entity_id: str) -> Optional[Entity]:
-        for e in self.entities:
-            if e.id == entity_id:
-                return e
-        return None
+        return self._by_id.get(entity_id)
@@ -1,27 +1,22 @@
 """Plugin manager — auto-discovers and loads OSINT modules."""
+import importlib
 import logging
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from eirescope.core.entity import EntityType
 from eirescope.modules.base import BaseOSINTModule
-from eirescope.modules.username_module import UsernameModule
-from eirescope.modules.email_module import EmailModule
-from eirescope.modules.phone_module import PhoneModule
-from eirescope.modules.ip_module import IPModule
-from eirescope.modules.domain_module import DomainModule
-from eirescope.modules.social_module import SocialMediaModule
-from eirescope.modules.irish_cro_module import IrishCROModule
 
 logger = logging.getLogger("eirescope.core.plugins")
 
-# Registry of all available modules
+# Registry of all available modules as (module path, class name). Imported on
+# load, so importing this file does not pull in every module's dependencies.
 AVAILABLE_MODULES = [
-    UsernameModule,
-    EmailModule,
-    PhoneModule,
-    IPModule,
-    DomainModule,
-    SocialMediaModule,
-    IrishCROModule,
+    ("eirescope.modules.username_module", "UsernameModule"),
+    ("eirescope.modules.email_module", "EmailModule"),
+    ("eirescope.modules.phone_module", "PhoneModule"),
+    ("eirescope.modules.ip_module", "IPModule"),
+    ("eirescope.modules.domain_module", "DomainModule"),
+    ("eirescope.modules.social_module", "SocialMediaModule"),
+    ("eirescope.modules.irish_cro_module", "IrishCROModule"),
 ]
 
 
@@ -31,21 +26,34 @@ class PluginManager:
     def __init__(self, config: Dict = None):
         self.config = config or {}
         self.modules: Dict[str, BaseOSINTModule] = {}
+        # Modules never change after load, so dispatch tables are built once
+        self._by_type: Dict[EntityType, List[BaseOSINTModule]] = {}
+        self._supported_types: List[str] = []
+        self._execute: Dict[str, Callable] = {}
         self._load_modules()
 
     def _load_modules(self):
         """Load all registered OSINT modules."""
-        for module_class in AVAILABLE_MODULES:
+        for module_path, class_name in AVAILABLE_MODULES:
             try:
+                module_class = getattr(importlib.import_module(module_path), class_name)
                 module = module_class(config=self.config)
                 self.modules[module.name] = module
-                logger.info(f"Loaded module: {module.name}")
+                self._execute[module.name] = module.execute
+                for entity_type in module.supported_entity_types:
+                    self._by_type.setdefault(entity_type, []).append(module)
+                logger.info("Loaded module: %s", module.name)
             except Exception as e:
-                logger.error(f"Failed to load module {module_class.__name__}: {e}")
+                logger.error("Failed to load module %s: %s", class_name, e)
+        self._supported_types = sorted(t.value for t in self._by_type)
 
     def get_modules_for_entity(self, entity_type: EntityType) -> List[BaseOSINTModule]:
         """Get all modules that can handle a given entity type."""
-        return [m for m in self.modules.values() if m.can_handle(entity_type)]
+        return list(self._by_type.get(entity_type, ()))
+
+    def get_executor(self, name: str) -> Optional[Callable]:
+        """Get the cached bound ``execute`` method of a loaded module."""
+        return self._execute.get(name)
 
     def get_module(self, name: str) -> Optional[BaseOSINTModule]:
         """Get a specific module by name."""
@@ -57,8 +65,4 @@ class PluginManager:
 
     def get_supported_types(self) -> List[str]:
         """Get all entity types supported by at least one module."""
-        types = set()
-        for module in self.modules.values():
-            for t in module.supported_entity_types:
-                types.add(t.value)
-        return sorted(types)
+        return list(self._supported_types)
@@ -6,28 +6,31 @@ from eirescope.core.entity import Investigation, EntityType
 
 def summarize_investigation(investigation: Investigation) -> Dict:
     """Generate a summary of an investigation for display."""
-    entity_counts = Counter(e.entity_type.value for e in investigation.entities)
+    ids, values, types, confs, sources = investigation.node_columns()
+    entity_counts = Counter(types)
     rel_counts = Counter(r.relationship_type for r in investigation.relationships)
 
-    # Build graph data for D3.js visualization
-    nodes = []
-    for e in investigation.entities:
-        nodes.append({
-            "id": e.id,
-            "label": _truncate(e.value, 40),
-            "type": e.entity_type.value,
-            "confidence": e.confidence,
-            "source": e.source_module,
-        })
+    # Build graph data for D3.js visualization (labels truncated to 40 chars)
+    nodes = [
+        {
+            "id": i,
+            "label": v if len(v) <= 40 else v[:37] + "...",
+            "type": t,
+            "confidence": c,
+            "source": s,
+        }
+        for i, v, t, c, s in zip(ids, values, types, confs, sources)
+    ]
 
-    links = []
-    for r in investigation.relationships:
-        links.append({
+    links = [
+        {
             "source": r.source_entity_id,
             "target": r.target_entity_id,
             "type": r.relationship_type,
             "confidence": r.confidence,
-        })
+        }
+        for r in investigation.relationships
+    ]
 
     return {
         "id": investigation.id,
@@ -45,9 +48,3 @@ def summarize_investigation(investigation: Investigation) -> Dict:
         "entities": [e.to_dict() for e in investigation.entities],
         "relationships": [r.to_dict() for r in investigation.relationships],
     }
-
-
-def _truncate(text: str, max_len: int) -> str:
-    if len(text) <= max_len:
-        return text
-    return text[:max_len - 3] + "..."
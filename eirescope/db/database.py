@@ -1,11 +1,17 @@
 """SQLite database for persisting EireScope investigations."""
 import os
-import json
+import queue
 import sqlite3
 import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict
 from datetime import datetime
-from eirescope.core.entity import Entity, EntityType, EntityRelationship, Investigation
+from eirescope.core.entity import (
+    Entity, EntityRelationship, Investigation, ENTITY_TYPE_BY_VALUE,
+)
+from eirescope.utils import serialization
 
 logger = logging.getLogger("eirescope.db")
 
@@ -18,7 +24,8 @@ CREATE TABLE IF NOT EXISTS investigations (
     notes TEXT DEFAULT '',
     modules_run TEXT DEFAULT '[]',
     created_at TEXT NOT NULL,
-    completed_at TEXT
+    completed_at TEXT,
+    entity_count INTEGER DEFAULT 0
 );
 
 CREATE TABLE IF NOT EXISTS entities (
@@ -50,114 +57,204 @@ CREATE INDEX IF NOT EXISTS idx_entities_investigation ON entities(investigation_
 CREATE INDEX IF NOT EXISTS idx_relationships_investigation ON relationships(investigation_id);
 CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(entity_type);
 CREATE INDEX IF NOT EXISTS idx_entities_value ON entities(value);
+CREATE INDEX IF NOT EXISTS idx_entities_type_value ON entities(entity_type, value);
+CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships(source_entity_id);
+CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships(target_entity_id);
+CREATE INDEX IF NOT EXISTS idx_investigations_created ON investigations(created_at DESC);
 """
 
+# Per-connection tuning. journal_mode=WAL is persisted in the database file,
+# the rest must be re-applied on every new connection.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA foreign_keys=ON",
+)
+
 
 class Database:
     """SQLite database manager for EireScope investigations."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool_size: int = 5):
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self._init_db()
+        # One shared writer (SQLite allows a single writer anyway) and a pool
+        # of reader connections, all opened once and reused across requests.
+        self._write_lock = threading.Lock()
+        self._write_conn = self._connect()
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._readers.put(self._connect())
+        self._executor = ThreadPoolExecutor(max_workers=pool_size,
+                                            thread_name_prefix="eirescope-db")
 
     def _init_db(self):
         with sqlite3.connect(self.db_path) as conn:
             conn.executescript(CREATE_TABLES_SQL)
+            self._migrate(conn)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Refresh planner statistics; analysis_limit bounds the cost on large DBs
+            conn.execute("PRAGMA analysis_limit=400")
+            conn.execute("ANALYZE")
             conn.commit()
         logger.info(f"Database initialized at {self.db_path}")
 
-    def _conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+    def _migrate(self, conn: sqlite3.Connection):
+        """Bring databases created by older versions up to the current schema."""
+        columns = {r[1] for r in conn.execute("PRAGMA table_info(investigations)")}
+        if "entity_count" not in columns:
+            conn.execute("ALTER TABLE investigations ADD COLUMN entity_count INTEGER DEFAULT 0")
+            conn.execute(
+                """UPDATE investigations SET entity_count = (
+                       SELECT COUNT(*) FROM entities e WHERE e.investigation_id = investigations.id
+                   )"""
+            )
+            logger.info("Migrated investigations table: added entity_count")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
 
+    @contextmanager
+    def _read(self):
+        """Check out a pooled read connection."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _write(self):
+        """Hold the writer connection; commits on success, rolls back on error."""
+        with self._write_lock:
+            try:
+                yield self._write_conn
+                self._write_conn.commit()
+            except Exception:
+                self._write_conn.rollback()
+                raise
+
+    def close(self):
+        """Close all pooled connections."""
+        self._executor.shutdown(wait=True)
+        with self._write_lock:
+            self._write_conn.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
     def save_investigation(self, inv: Investigation):
         """Save or update an investigation and all its entities/relationships."""
-        with self._conn() as conn:
+        # Serialize every JSON blob up front so the write lock only covers the inserts.
+        inv_row = (inv.id, inv.initial_query, inv.initial_type.value, inv.status,
+                   inv.notes, serialization.dumps(inv.modules_run), inv.created_at,
+                   inv.completed_at, len(inv.entities))
+        ent_rows = [
+            (e.id, inv.id, e.entity_type.value, e.value, e.source_module,
+             e.confidence, serialization.dumps(e.metadata), e.created_at)
+            for e in inv.entities
+        ]
+        rel_rows = [
+            (r.id, inv.id, r.source_entity_id, r.target_entity_id,
+             r.relationship_type, r.confidence, serialization.dumps(r.evidence))
+            for r in inv.relationships
+        ]
+
+        with self._write() as conn:
             conn.execute(
                 """INSERT OR REPLACE INTO investigations
-                   (id, initial_query, initial_type, status, notes, modules_run, created_at, completed_at)
+                   (id, initial_query, initial_type, status, notes, modules_run, created_at,
+                    completed_at, entity_count)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                inv_row,
+            )
+            conn.executemany(
+                """INSERT OR REPLACE INTO entities
+                   (id, investigation_id, entity_type, value, source_module, confidence, metadata, created_at)
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (inv.id, inv.initial_query, inv.initial_type.value, inv.status,
-                 inv.notes, json.dumps(inv.modules_run), inv.created_at, inv.completed_at),
+                ent_rows,
+            )
+            conn.executemany(
+                """INSERT OR REPLACE INTO relationships
+                   (id, investigation_id, source_entity_id, target_entity_id,
+                    relationship_type, confidence, evidence)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                rel_rows,
             )
-            for entity in inv.entities:
-                conn.execute(
-                    """INSERT OR REPLACE INTO entities
-                       (id, investigation_id, entity_type, value, source_module, confidence, metadata, created_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (entity.id, inv.id, entity.entity_type.value, entity.value,
-                     entity.source_module, entity.confidence,
-                     json.dumps(entity.metadata), entity.created_at),
-                )
-            for rel in inv.relationships:
-                conn.execute(
-                    """INSERT OR REPLACE INTO relationships
-                       (id, investigation_id, source_entity_id, target_entity_id,
-                        relationship_type, confidence, evidence)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (rel.id, inv.id, rel.source_entity_id, rel.target_entity_id,
-                     rel.relationship_type, rel.confidence, json.dumps(rel.evidence)),
-                )
-            conn.commit()
 
     def load_investigation(self, inv_id: str) -> Optional[Investigation]:
         """Load a full investigation by ID."""
-        with self._conn() as conn:
+        with self._read() as conn:
             row = conn.execute(
                 "SELECT * FROM investigations WHERE id = ?", (inv_id,)
             ).fetchone()
-            if not row:
-                return None
-
-            inv = Investigation(
-                id=row["id"],
-                initial_query=row["initial_query"],
-                initial_type=EntityType(row["initial_type"]),
-                status=row["status"],
-                notes=row["notes"] or "",
-                modules_run=json.loads(row["modules_run"]),
-                created_at=row["created_at"],
-                completed_at=row["completed_at"],
-            )
+        if not row:
+            return None
+
+        # Entities and relationships are fetched concurrently on two pooled
+        # readers (WAL allows parallel readers; sqlite3 releases the GIL while
+        # stepping). Our reader is returned before waiting on the other, so
+        # concurrent loads cannot deadlock on the pool.
+        entities_future = self._executor.submit(
+            self._fetch_all, "SELECT * FROM entities WHERE investigation_id = ?", inv_id
+        )
+        rel_rows = self._fetch_all(
+            "SELECT * FROM relationships WHERE investigation_id = ?", inv_id
+        )
+        entity_rows = entities_future.result()
+
+        inv = Investigation(
+            id=row["id"],
+            initial_query=row["initial_query"],
+            initial_type=ENTITY_TYPE_BY_VALUE[row["initial_type"]],
+            status=row["status"],
+            notes=row["notes"] or "",
+            modules_run=serialization.loads(row["modules_run"]),
+            created_at=row["created_at"],
+            completed_at=row["completed_at"],
+        )
 
-            for erow in conn.execute(
-                "SELECT * FROM entities WHERE investigation_id = ?", (inv_id,)
-            ):
-                inv.entities.append(Entity(
-                    id=erow["id"],
-                    entity_type=EntityType(erow["entity_type"]),
-                    value=erow["value"],
-                    source_module=erow["source_module"],
-                    confidence=erow["confidence"],
-                    metadata=json.loads(erow["metadata"]),
-                    created_at=erow["created_at"],
-                ))
-
-            for rrow in conn.execute(
-                "SELECT * FROM relationships WHERE investigation_id = ?", (inv_id,)
-            ):
-                inv.relationships.append(EntityRelationship(
-                    id=rrow["id"],
-                    source_entity_id=rrow["source_entity_id"],
-                    target_entity_id=rrow["target_entity_id"],
-                    relationship_type=rrow["relationship_type"],
-                    confidence=rrow["confidence"],
-                    evidence=json.loads(rrow["evidence"]),
-                ))
-
-            return inv
+        for erow in entity_rows:
+            inv.add_entity(Entity(
+                id=erow["id"],
+                entity_type=ENTITY_TYPE_BY_VALUE[erow["entity_type"]],
+                value=erow["value"],
+                source_module=erow["source_module"],
+                confidence=erow["confidence"],
+                metadata=serialization.loads(erow["metadata"]),
+                created_at=erow["created_at"],
+            ))
+
+        for rrow in rel_rows:
+            inv.relationships.append(EntityRelationship(
+                id=rrow["id"],
+                source_entity_id=rrow["source_entity_id"],
+                target_entity_id=rrow["target_entity_id"],
+                relationship_type=rrow["relationship_type"],
+                confidence=rrow["confidence"],
+                evidence=serialization.loads(rrow["evidence"]),
+            ))
+
+        return inv
+
+    def _fetch_all(self, sql: str, *params) -> List[sqlite3.Row]:
+        with self._read() as conn:
+            return conn.execute(sql, params).fetchall()
 
     def list_investigations(self, limit: int = 50) -> List[Dict]:
         """List recent investigations (summary only)."""
-        with self._conn() as conn:
+        with self._read() as conn:
             rows = conn.execute(
-                """SELECT i.*, COUNT(e.id) as entity_count
-                   FROM investigations i
-                   LEFT JOIN entities e ON e.investigation_id = i.id
-                   GROUP BY i.id
-                   ORDER BY i.created_at DESC LIMIT ?""",
+                """SELECT id, initial_query, initial_type, status, entity_count,
+                          created_at, completed_at
+                   FROM investigations
+                   ORDER BY created_at DESC LIMIT ?""",
                 (limit,),
             ).fetchall()
             return [
@@ -175,8 +272,7 @@ class Database:
 
     def delete_investigation(self, inv_id: str):
         """Delete an investigation and all associated data."""
-        with self._conn() as conn:
+        with self._write() as conn:
             conn.execute("DELETE FROM relationships WHERE investigation_id = ?", (inv_id,))
             conn.execute("DELETE FROM entities WHERE investigation_id = ?", (inv_id,))
             conn.execute("DELETE FROM investigations WHERE id = ?", (inv_id,))
-            conn.commit()
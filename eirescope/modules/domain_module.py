@@ -1,15 +1,64 @@
 """Domain OSINT Module — DNS records, WHOIS, subdomain enumeration."""
 import re
 import socket
-import subprocess
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
+import dns.asyncresolver
+import dns.resolver
 from eirescope.core.entity import Entity, EntityType, Investigation
 from eirescope.modules.base import BaseOSINTModule
-from eirescope.utils.http_client import OSINTHTTPClient
+from eirescope.utils.http_client import get_shared_client
+from eirescope.utils import dns_cache, serialization, whois_client
 
 logger = logging.getLogger("eirescope.modules.domain")
 
+# WHOIS is a loose "tag: value" format; each line is matched once and its
+# lowercased tag dispatched through _WHOIS_TAGS. The value is taken verbatim
+# and stripped in Python: a lazy `(.+?)\s*$` capture backtracks quadratically
+# on long runs of trailing whitespace in hostile responses.
+_WHOIS_LINE = re.compile(r"\s*([A-Za-z][\w \-/()]{0,40}?):(.*)")
+_WHOIS_MAX_LINES = 500
+_WHOIS_TAGS = {
+    "registrar": "registrar",
+    "sponsoring registrar": "registrar",
+    "creation date": "creation_date",
+    "created": "creation_date",
+    "registry expiry date": "expiry_date",
+    "registrar registration expiration date": "expiry_date",
+    "expiration date": "expiry_date",
+    "expires": "expiry_date",
+    "updated date": "updated_date",
+    "last-modified": "updated_date",
+    "registrant name": "registrant_name",
+    "registrant": "registrant_name",
+    "registrant organization": "registrant_org",
+    "org": "registrant_org",
+    "registrant email": "registrant_email",
+    "e-mail": "registrant_email",
+    "registrant country": "registrant_country",
+    "country": "registrant_country",
+    "name server": "name_servers",
+    "nserver": "name_servers",
+    "domain status": "status",
+    "status": "status",
+}
+# Fields that collect every occurrence; the rest keep the first one seen
+_WHOIS_LIST_FIELDS = frozenset(("name_servers", "status"))
+# Fields whose value is a single token
+_WHOIS_TOKEN_FIELDS = frozenset(("registrant_email", "registrant_country", "name_servers"))
+
+# Policy record tags (RFC 7208 / RFC 7489); matched case-insensitively without lowercasing
+_SPF_RX = re.compile(r"\s*v=spf1\b", re.IGNORECASE)
+_DMARC_RX = re.compile(r"\s*v=DMARC1\b", re.IGNORECASE)
+
+# Upper bound on subdomains kept from crt.sh, to bound memory on huge zones
+_MAX_SUBDOMAINS = 50_000
+
+# One resolver for the whole process; it parses resolv.conf once
+_resolver = dns.asyncresolver.Resolver()
+
 
 class DomainModule(BaseOSINTModule):
     """Domain reconnaissance — DNS, WHOIS, subdomain discovery."""
@@ -22,7 +71,7 @@ class DomainModule(BaseOSINTModule):
 
     def __init__(self, config=None):
         super().__init__(config)
-        self.http = OSINTHTTPClient(timeout=10, max_retries=2, rate_limit=0.5)
+        self.http = get_shared_client(timeout=10, max_retries=2, rate_limit=0.5)
 
     def execute(self, entity: Entity, investigation: Investigation) -> List[Entity]:
         """Run domain reconnaissance."""
@@ -30,8 +79,24 @@ class DomainModule(BaseOSINTModule):
         logger.info(f"Analyzing domain: {domain}")
         found_entities = []
 
+        # WHOIS and crt.sh are independent of DNS, so they run in the background
+        # while the DNS queries are in flight; results are consumed in step order.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            whois_future = executor.submit(self._whois_lookup, domain)
+            subdomains_future = executor.submit(self._enumerate_subdomains, domain)
+
+            # 1-4. DNS records, all queried concurrently
+            a_records, mx_records, ns_records, txt_records, dmarc_records = asyncio.run(
+                self._gather_dns(domain)
+            )
+            whois_data = whois_future.result()
+            subdomains = subdomains_future.result()
+
+        # Discoveries are staged as (source, target, rel_type, confidence) and
+        # flushed into the investigation in one batch at the end.
+        staged = []
+
         # 1. DNS A records → get IP addresses
-        a_records = self._dns_lookup(domain, "A")
         entity.metadata["a_records"] = a_records
         for ip in a_records:
             ip_entity = Entity(
@@ -41,31 +106,20 @@ class DomainModule(BaseOSINTModule):
                 confidence=0.95,
                 metadata={"domain": domain, "record_type": "A"},
             )
-            added = investigation.add_entity(ip_entity)
-            investigation.add_relationship(
-                source_id=entity.id,
-                target_id=added.id,
-                rel_type="domain_resolves_to",
-                confidence=0.95,
-            )
-            found_entities.append(added)
+            staged.append((entity, ip_entity, "domain_resolves_to", 0.95))
 
         # 2. MX records
-        mx_records = self._dns_lookup(domain, "MX")
         entity.metadata["mx_records"] = mx_records
 
         # 3. NS records
-        ns_records = self._dns_lookup(domain, "NS")
         entity.metadata["ns_records"] = ns_records
 
         # 4. TXT records (SPF, DKIM, DMARC)
-        txt_records = self._dns_lookup(domain, "TXT")
         entity.metadata["txt_records"] = txt_records
-        entity.metadata["spf"] = [r for r in txt_records if "spf" in r.lower()]
-        entity.metadata["dmarc"] = self._dns_lookup(f"_dmarc.{domain}", "TXT")
+        entity.metadata["spf"] = [r for r in txt_records if _SPF_RX.match(r)]
+        entity.metadata["dmarc"] = [r for r in dmarc_records if _DMARC_RX.match(r)]
 
         # 5. WHOIS
-        whois_data = self._whois_lookup(domain)
         if whois_data:
             entity.metadata["whois"] = whois_data
             whois_entity = Entity(
@@ -75,14 +129,7 @@ class DomainModule(BaseOSINTModule):
                 confidence=0.9,
                 metadata=whois_data,
             )
-            added = investigation.add_entity(whois_entity)
-            investigation.add_relationship(
-                source_id=entity.id,
-                target_id=added.id,
-                rel_type="has_whois_record",
-                confidence=0.9,
-            )
-            found_entities.append(added)
+            staged.append((entity, whois_entity, "has_whois_record", 0.9))
 
             # Extract registrant email if available
             if whois_data.get("registrant_email"):
@@ -93,35 +140,42 @@ class DomainModule(BaseOSINTModule):
                     confidence=0.7,
                     metadata={"source": "domain_whois", "domain": domain},
                 )
-                added = investigation.add_entity(email_entity)
-                investigation.add_relationship(
-                    source_id=entity.id,
-                    target_id=added.id,
-                    rel_type="domain_registered_by",
-                    confidence=0.7,
-                )
-                found_entities.append(added)
+                staged.append((entity, email_entity, "domain_registered_by", 0.7))
 
         # 6. Subdomain enumeration via crt.sh
-        subdomains = self._enumerate_subdomains(domain)
         entity.metadata["subdomains"] = subdomains
         entity.metadata["subdomain_count"] = len(subdomains)
-        for sub in subdomains[:20]:  # Limit to top 20
+        top_subdomains = subdomains[:20]  # Limit to top 20
+        resolved = asyncio.run(self._resolve_bulk(top_subdomains)) if top_subdomains else {}
+        for sub in top_subdomains:
+            sub_ips = resolved.get(sub, [])
             sub_entity = Entity(
                 entity_type=EntityType.DOMAIN,
                 value=sub,
                 source_module=self.name,
                 confidence=0.8,
-                metadata={"parent_domain": domain, "source": "crt.sh"},
-            )
-            added = investigation.add_entity(sub_entity)
-            investigation.add_relationship(
-                source_id=entity.id,
-                target_id=added.id,
-                rel_type="has_subdomain",
-                confidence=0.8,
+                metadata={"parent_domain": domain, "source": "crt.sh", "a_records": sub_ips},
             )
-            found_entities.append(added)
+            staged.append((entity, sub_entity, "has_subdomain", 0.8))
+            for ip in sub_ips:
+                ip_entity = Entity(
+                    entity_type=EntityType.IP_ADDRESS,
+                    value=ip,
+                    source_module=self.name,
+                    confidence=0.9,
+                    metadata={"domain": sub, "parent_domain": domain, "record_type": "A"},
+                )
+                staged.append((sub_entity, ip_entity, "domain_resolves_to", 0.9))
+
+        # Flush: dedupe-resolved instances replace the staged ones in relationships
+        added = investigation.add_entities([target for _, target, _, _ in staged])
+        stored = {id(e): a for (_, e, _, _), a in zip(staged, added)}
+        stored[id(entity)] = entity
+        investigation.add_relationships([
+            (stored[id(source)].id, stored[id(target)].id, rel_type, confidence)
+            for source, target, rel_type, confidence in staged
+        ])
+        found_entities.extend(added)
 
         # 7. Security analysis
         entity.metadata["security"] = {
@@ -134,95 +188,128 @@ class DomainModule(BaseOSINTModule):
         logger.info(f"Domain analysis complete: {len(found_entities)} entities discovered")
         return found_entities
 
-    def _dns_lookup(self, domain: str, record_type: str) -> List[str]:
-        """DNS lookup using dig command."""
+    async def _gather_dns(self, domain: str) -> List[List[str]]:
+        """Resolve A, MX, NS, TXT and DMARC TXT records in parallel."""
+        return await asyncio.gather(
+            self._dns_lookup(domain, "A"),
+            self._dns_lookup(domain, "MX"),
+            self._dns_lookup(domain, "NS"),
+            self._dns_lookup(domain, "TXT"),
+            self._dns_lookup(f"_dmarc.{domain}", "TXT"),
+        )
+
+    async def _resolve_bulk(self, names: List[str], concurrency: int = 200) -> Dict[str, List[str]]:
+        """Resolve A records for many names at once, bounded by a semaphore."""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(name: str):
+            async with sem:
+                return name, await self._dns_lookup(name, "A")
+
+        return dict(await asyncio.gather(*(one(n) for n in names)))
+
+    async def _dns_lookup(self, domain: str, record_type: str) -> List[str]:
+        """DNS lookup using the shared dnspython async resolver."""
+        cached = dns_cache.get(domain, record_type)
+        if cached is not None:
+            return cached
         try:
-            result = subprocess.run(
-                ["dig", "+short", record_type, domain],
-                capture_output=True, text=True, timeout=10,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                records = []
-                for line in result.stdout.strip().split("\n"):
-                    val = line.strip().rstrip(".")
-                    if val and not val.startswith(";"):
-                        # For MX, extract just the server name
-                        if record_type == "MX":
-                            parts = val.split()
-                            if len(parts) >= 2:
-                                val = f"{parts[0]} {parts[1].rstrip('.')}"
-                        records.append(val)
-                return records
+            answer = await _resolver.resolve(domain, record_type, lifetime=10)
+            records = [self._format_rdata(r, record_type) for r in answer]
+            dns_cache.put(domain, record_type, records, ttl=answer.rrset.ttl)
+            return records
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            dns_cache.put(domain, record_type, [])
+            return []
         except Exception as e:
             logger.debug(f"DNS {record_type} lookup failed for {domain}: {e}")
 
-        # Fallback for A records using socket
+        # Fallback for A records using the system resolver (e.g. no reachable nameserver)
         if record_type == "A":
             try:
-                results = socket.getaddrinfo(domain, None, socket.AF_INET)
-                return list(set(r[4][0] for r in results))
+                # Numeric port + SOCK_STREAM: one result per address, no service lookup
+                results = await asyncio.get_running_loop().getaddrinfo(
+                    domain, 0, family=socket.AF_INET, type=socket.SOCK_STREAM,
+                    flags=socket.AI_ADDRCONFIG | socket.AI_NUMERICSERV,
+                )
+                return list({r[4][0] for r in results})
             except Exception:
                 pass
         return []
 
+    @staticmethod
+    def _format_rdata(rdata, record_type: str) -> str:
+        if record_type == "A":
+            return rdata.address
+        if record_type == "MX":
+            return f"{rdata.preference} {rdata.exchange.to_text().rstrip('.')}"
+        if record_type == "TXT":
+            return b"".join(rdata.strings).decode("utf-8", "replace")
+        return rdata.to_text().rstrip(".")
+
     def _whois_lookup(self, domain: str) -> Optional[Dict]:
         """WHOIS lookup for domain."""
         try:
-            result = subprocess.run(
-                ["whois", domain],
-                capture_output=True, text=True, timeout=15,
-            )
-            if result.returncode == 0 and result.stdout:
-                return self._parse_whois(result.stdout)
-        except FileNotFoundError:
-            logger.debug("whois command not found")
+            raw = whois_client.lookup_domain(domain, timeout=15)
+            if raw:
+                return self._parse_whois(raw)
         except Exception as e:
             logger.debug(f"WHOIS lookup failed for {domain}: {e}")
         return None
 
     def _parse_whois(self, raw: str) -> Dict:
-        """Parse domain WHOIS output."""
+        """Parse domain WHOIS output in a single pass over its lines."""
         data = {"raw": raw[:3000]}
-        patterns = {
-            "registrar": r"(?:Registrar|registrar):\s*(.+)",
-            "creation_date": r"(?:Creation Date|created):\s*(.+)",
-            "expiry_date": r"(?:Registry Expiry Date|Expiration Date|expires):\s*(.+)",
-            "updated_date": r"(?:Updated Date|last-modified):\s*(.+)",
-            "registrant_name": r"(?:Registrant Name|registrant):\s*(.+)",
-            "registrant_org": r"(?:Registrant Organization|org):\s*(.+)",
-            "registrant_email": r"(?:Registrant Email|e-mail):\s*(\S+@\S+)",
-            "registrant_country": r"(?:Registrant Country|country):\s*(\S+)",
-            "name_servers": r"(?:Name Server|nserver):\s*(\S+)",
-            "status": r"(?:Domain Status|status):\s*(.+)",
-        }
-        for key, pattern in patterns.items():
-            matches = re.findall(pattern, raw, re.IGNORECASE)
-            if matches:
-                if key in ("name_servers", "status"):
-                    data[key] = [m.strip().lower() for m in matches]
-                else:
-                    data[key] = matches[0].strip()
+        for line in raw.splitlines()[:_WHOIS_MAX_LINES]:
+            m = _WHOIS_LINE.match(line)
+            if not m:
+                continue
+            key = _WHOIS_TAGS.get(m.group(1).lower())
+            if key is None:
+                continue
+            value = m.group(2).strip()
+            if not value:
+                continue
+            if key in _WHOIS_TOKEN_FIELDS:
+                value = value.split()[0]
+                if key == "registrant_email" and "@" not in value:
+                    continue
+            if key in _WHOIS_LIST_FIELDS:
+                data.setdefault(key, []).append(value.lower())
+            elif key not in data:
+                data[key] = value
         return data
 
     def _enumerate_subdomains(self, domain: str) -> List[str]:
         """Enumerate subdomains using crt.sh certificate transparency."""
         try:
+            # Popular zones return tens of MB; stream and keep only name_value
             resp = self.http.get(
                 f"https://crt.sh/?q=%.{domain}&output=json",
                 headers={"Accept": "application/json"},
+                stream=True,
             )
-            if resp and resp.status_code == 200:
-                certs = resp.json()
+            if resp is None:
+                return []
+            try:
+                if resp.status_code != 200:
+                    return []
                 subdomains = set()
+                # Strict subdomains of `domain`, no wildcards; one C-level match per entry
+                sub_rx = re.compile(rf"(?!\*)[a-z0-9_\-.]+\.{re.escape(domain)}")
+                certs = serialization.iter_json_array(resp.iter_content(chunk_size=65536))
                 for cert in certs:
                     name = cert.get("name_value", "")
                     for entry in name.split("\n"):
-                        entry = entry.strip().lower()
-                        if entry.endswith(domain) and entry != domain:
-                            # Skip wildcards
-                            if not entry.startswith("*"):
-                                subdomains.add(entry)
+                        m = sub_rx.fullmatch(entry.strip().lower())
+                        if m:
+                            subdomains.add(m.group(0))
+                    if len(subdomains) >= _MAX_SUBDOMAINS:
+                        break
                 return sorted(subdomains)
+            finally:
+                # Also on crt.sh's frequent 502/503s: release the pooled connection
+                resp.close()
         except Exception as e:
             logger.debug(f"Subdomain enumeration failed for {domain}: {e}")
         return []
@@ -1,14 +1,65 @@
 """Email OSINT Module — Email enrichment, breach checks, and domain analysis."""
 import re
 import socket
+import hashlib
 import logging
-from typing import List, Dict, Optional
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, FrozenSet, Optional
+import dns.resolver
 from eirescope.core.entity import Entity, EntityType, Investigation
 from eirescope.modules.base import BaseOSINTModule
-from eirescope.utils.http_client import OSINTHTTPClient
+from eirescope.utils.http_client import get_shared_client, get_response_cache
+from eirescope.utils import dns_cache
+from eirescope.utils.cache import TTLCache
 
 logger = logging.getLogger("eirescope.modules.email")
 
+# Long-lived resolver for MX lookups; parses resolv.conf once
+_resolver = dns.resolver.Resolver()
+
+# email -> Gravatar result (None = no Gravatar); only definitive answers are cached
+_gravatar_cache = TTLCache(maxsize=1024, ttl=3600)
+# sha256(email) -> avatar ETag, outlives the result cache for conditional revalidation
+_gravatar_etags = TTLCache(maxsize=4096, ttl=7 * 86400)
+_MISS = object()
+
+PROVIDER_MAP: Dict[str, str] = {
+    "gmail.com": "Google (Gmail)",
+    "googlemail.com": "Google (Gmail)",
+    "outlook.com": "Microsoft (Outlook)",
+    "hotmail.com": "Microsoft (Hotmail)",
+    "live.com": "Microsoft (Live)",
+    "yahoo.com": "Yahoo",
+    "protonmail.com": "ProtonMail",
+    "proton.me": "ProtonMail",
+    "icloud.com": "Apple (iCloud)",
+    "me.com": "Apple",
+    "aol.com": "AOL",
+    "zoho.com": "Zoho",
+}
+
+# MX host keywords -> hosted provider. MX records are sorted by priority, so the
+# leftmost keyword hit belongs to the preferred mail exchanger.
+_MX_PROVIDER_RX = re.compile(r"google|gmail|outlook|microsoft|protonmail|zoho")
+_MX_HIT_TO_PROVIDER = {
+    "google": "Google Workspace",
+    "gmail": "Google Workspace",
+    "outlook": "Microsoft 365",
+    "microsoft": "Microsoft 365",
+    "protonmail": "ProtonMail",
+    "zoho": "Zoho",
+}
+
+DISPOSABLE_DOMAINS: FrozenSet[str] = frozenset({
+    "tempmail.com", "guerrillamail.com", "mailinator.com",
+    "throwaway.email", "temp-mail.org", "fakeinbox.com",
+    "sharklasers.com", "guerrillamailblock.com", "grr.la",
+    "dispostable.com", "yopmail.com", "trashmail.com",
+    "maildrop.cc", "10minutemail.com", "tempail.com",
+    "burnermail.io", "mailnesia.com", "tempr.email",
+})
+
 
 class EmailModule(BaseOSINTModule):
     """Enrich email addresses with breach data, domain info, and associated accounts."""
@@ -22,7 +73,14 @@ class EmailModule(BaseOSINTModule):
 
     def __init__(self, config=None):
         super().__init__(config)
-        self.http = OSINTHTTPClient(timeout=10, max_retries=2, rate_limit=0.5)
+        self.http = get_shared_client(
+            timeout=10, max_retries=2, rate_limit=0.5,
+            cache=get_response_cache(self.config.get("CACHE_DIR")),
+        )
+        self._hibp_headers = {
+            "hibp-api-key": self.api_key,
+            "User-Agent": "EireScope-OSINT",
+        } if self.api_key else None
 
     def execute(self, entity: Entity, investigation: Investigation) -> List[Entity]:
         """Run email enrichment pipeline."""
@@ -31,6 +89,7 @@ class EmailModule(BaseOSINTModule):
         found_entities = []
 
         local_part, domain = email.split("@", 1)
+        domain = domain.rstrip(".")
 
         # 1. Extract username from email local part
         username_entity = Entity(
@@ -78,10 +137,14 @@ class EmailModule(BaseOSINTModule):
         entity.metadata["email_provider"] = provider
 
         # 5. Check for known disposable email domains
-        entity.metadata["is_disposable"] = self._is_disposable_domain(domain)
+        is_disposable = self._is_disposable_domain(domain)
+        entity.metadata["is_disposable"] = is_disposable
 
-        # 6. Check HaveIBeenPwned (if API key available)
-        breach_results = self._check_breaches(email)
+        # 6. Check breach sources; the Gravatar probe (step 7) runs alongside
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            gravatar_future = executor.submit(self._check_gravatar, email)
+            breach_results = self._check_breaches(email, skip=is_disposable)
+            gravatar_info = gravatar_future.result()
         if breach_results:
             entity.metadata["breaches"] = breach_results
             entity.metadata["breach_count"] = len(breach_results)
@@ -103,8 +166,7 @@ class EmailModule(BaseOSINTModule):
                 )
                 found_entities.append(added_breach)
 
-        # 7. Check Gravatar for profile
-        gravatar_info = self._check_gravatar(email)
+        # 7. Gravatar profile
         if gravatar_info:
             entity.metadata["gravatar"] = gravatar_info
 
@@ -113,121 +175,131 @@ class EmailModule(BaseOSINTModule):
 
     def _check_mx_records(self, domain: str) -> List[Dict]:
         """Check MX records for the email domain."""
-        try:
-            import subprocess
-            result = subprocess.run(
-                ["dig", "+short", "MX", domain],
-                capture_output=True, text=True, timeout=10,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                records = []
-                for line in result.stdout.strip().split("\n"):
-                    parts = line.strip().split()
-                    if len(parts) >= 2:
-                        records.append({
-                            "priority": int(parts[0]),
-                            "server": parts[1].rstrip("."),
-                        })
-                return sorted(records, key=lambda x: x["priority"])
-        except Exception as e:
-            logger.debug(f"MX lookup failed for {domain}: {e}")
+        # Shared with DomainModule, which caches MX answers as "<priority> <server>"
+        cached = dns_cache.get(domain, "MX")
+        if cached:
+            return self._mx_to_dicts(cached)
+        if cached is None:
+            try:
+                answer = _resolver.resolve(domain, "MX", lifetime=10)
+                records = [
+                    f"{r.preference} {r.exchange.to_text().rstrip('.')}" for r in answer
+                ]
+                dns_cache.put(domain, "MX", records, ttl=answer.rrset.ttl)
+                if records:
+                    return self._mx_to_dicts(records)
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                dns_cache.put(domain, "MX", [])
+            except Exception as e:
+                logger.debug(f"MX lookup failed for {domain}: {e}")
 
         # Fallback: try socket
         try:
-            socket.getaddrinfo(domain, 25)
+            socket.getaddrinfo(domain, 25, 0, socket.SOCK_STREAM, 0,
+                               socket.AI_ADDRCONFIG | socket.AI_NUMERICSERV)
             return [{"priority": 0, "server": domain, "note": "fallback check"}]
         except Exception:
             pass
         return []
 
+    @staticmethod
+    def _mx_to_dicts(records: List[str]) -> List[Dict]:
+        parsed = []
+        for record in records:
+            priority, _, server = record.partition(" ")
+            parsed.append({"priority": int(priority), "server": server})
+        return sorted(parsed, key=lambda x: x["priority"])
+
     def _detect_provider(self, domain: str, mx_records: List[Dict]) -> str:
-        """Detect email provider from domain or MX records."""
-        domain_lower = domain.lower()
-        mx_str = " ".join([r.get("server", "") for r in mx_records]).lower()
+        """Detect email provider from domain or MX records.
 
-        provider_map = {
-            "gmail.com": "Google (Gmail)",
-            "googlemail.com": "Google (Gmail)",
-            "outlook.com": "Microsoft (Outlook)",
-            "hotmail.com": "Microsoft (Hotmail)",
-            "live.com": "Microsoft (Live)",
-            "yahoo.com": "Yahoo",
-            "protonmail.com": "ProtonMail",
-            "proton.me": "ProtonMail",
-            "icloud.com": "Apple (iCloud)",
-            "me.com": "Apple",
-            "aol.com": "AOL",
-            "zoho.com": "Zoho",
-        }
-
-        if domain_lower in provider_map:
-            return provider_map[domain_lower]
-
-        if "google" in mx_str or "gmail" in mx_str:
-            return "Google Workspace"
-        if "outlook" in mx_str or "microsoft" in mx_str:
-            return "Microsoft 365"
-        if "protonmail" in mx_str:
-            return "ProtonMail"
-        if "zoho" in mx_str:
-            return "Zoho"
-
-        return "Custom/Unknown"
+        `domain` must already be lowercased and stripped (done once in execute).
+        """
+        provider = PROVIDER_MAP.get(domain)
+        if provider:
+            return provider
+
+        mx_str = " ".join([r.get("server", "") for r in mx_records]).lower()
+        m = _MX_PROVIDER_RX.search(mx_str)
+        return _MX_HIT_TO_PROVIDER[m.group(0)] if m else "Custom/Unknown"
 
     def _is_disposable_domain(self, domain: str) -> bool:
-        """Check if domain is a known disposable/temporary email provider."""
-        disposable_domains = {
-            "tempmail.com", "guerrillamail.com", "mailinator.com",
-            "throwaway.email", "temp-mail.org", "fakeinbox.com",
-            "sharklasers.com", "guerrillamailblock.com", "grr.la",
-            "dispostable.com", "yopmail.com", "trashmail.com",
-            "maildrop.cc", "10minutemail.com", "tempail.com",
-            "burnermail.io", "mailnesia.com", "tempr.email",
-        }
-        return domain.lower() in disposable_domains
-
-    def _check_breaches(self, email: str) -> List[Dict]:
-        """Check multiple breach databases for exposed credentials."""
+        """Check if a normalized domain is a known disposable/temporary email provider."""
+        return domain in DISPOSABLE_DOMAINS
+
+    def _check_breaches(self, email: str, skip: bool = False) -> List[Dict]:
+        """Check multiple breach databases for exposed credentials.
+
+        Sources are queried concurrently; results are merged in source order so
+        de-duplication keeps the same precedence as a sequential run. With
+        ``skip`` (e.g. a throwaway address) no source is queried at all.
+        """
+        if skip:
+            return []
+        sources = (
+            self._check_hibp,
+            self._check_xposedornot,
+            self._check_breachdirectory,
+            self._check_leakcheck,
+            self._check_emailrep,
+        )
+        # Percent-encode once: '+' and '/' are legal in addresses but not in a path segment
+        quoted = quote(email, safe="")
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = [executor.submit(source, email, quoted) for source in sources]
+
         all_breaches = []
+        seen = set()
+        for future in futures:
+            for breach in future.result():
+                if breach["name"] not in seen:
+                    seen.add(breach["name"])
+                    all_breaches.append(breach)
+        return all_breaches
 
-        # 1. HaveIBeenPwned (requires API key for full results)
-        if self.api_key:
-            try:
-                resp = self.http.get(
-                    f"https://haveibeenpwned.com/api/v3/breachedaccount/{email}",
-                    headers={
-                        "hibp-api-key": self.api_key,
-                        "User-Agent": "EireScope-OSINT",
-                    },
-                )
-                if resp and resp.status_code == 200:
-                    for b in resp.json():
-                        all_breaches.append({
-                            "name": b.get("Name", "Unknown"),
-                            "date": b.get("BreachDate", ""),
-                            "description": b.get("Description", ""),
-                            "data_classes": b.get("DataClasses", []),
-                            "is_verified": b.get("IsVerified", False),
-                            "source": "HaveIBeenPwned",
-                        })
-            except Exception as e:
-                logger.debug(f"HIBP check failed: {e}")
+    def _check_hibp(self, email: str, quoted: str) -> List[Dict]:
+        """HaveIBeenPwned (requires API key for full results)."""
+        breaches = []
+        if not self._hibp_headers:
+            return breaches
+        try:
+            resp = self.http.get(
+                f"https://haveibeenpwned.com/api/v3/breachedaccount/{quoted}",
+                headers=self._hibp_headers,
+            )
+            if resp and resp.status_code == 200:
+                for b in self.http.json(resp):
+                    breaches.append({
+                        "name": b.get("Name", "Unknown"),
+                        "date": b.get("BreachDate", ""),
+                        "description": b.get("Description", ""),
+                        "data_classes": b.get("DataClasses", []),
+                        "is_verified": b.get("IsVerified", False),
+                        "source": "HaveIBeenPwned",
+                    })
+        except Exception as e:
+            logger.debug(f"HIBP check failed: {e}")
+        return breaches
 
-        # 2. XposedOrNot (free, no key needed)
+    def _check_xposedornot(self, email: str, quoted: str) -> List[Dict]:
+        """XposedOrNot (free, no key needed)."""
+        breaches = []
         try:
             resp = self.http.get(
-                f"https://api.xposedornot.com/v1/check-email/{email}"
+                f"https://api.xposedornot.com/v1/check-email/{quoted}"
             )
             if resp and resp.status_code == 200:
-                data = resp.json()
+                data = self.http.json(resp)
                 if "breaches" in data:
                     for b in data["breaches"]:
-                        if not any(x["name"] == b for x in all_breaches):
-                            all_breaches.append({"name": b, "source": "XposedOrNot"})
+                        breaches.append({"name": b, "source": "XposedOrNot"})
         except Exception as e:
             logger.debug(f"XposedOrNot check failed: {e}")
+        return breaches
 
-        # 3. BreachDirectory (free tier)
+    def _check_breachdirectory(self, email: str, quoted: str) -> List[Dict]:
+        """BreachDirectory (free tier)."""
+        breaches = []
         try:
             resp = self.http.post(
                 "https://breachdirectory.p.rapidapi.com/",
@@ -239,52 +311,56 @@ class EmailModule(BaseOSINTModule):
                 data={"func": "auto", "term": email},
             )
             if resp and resp.status_code == 200:
-                data = resp.json()
+                data = self.http.json(resp)
                 if data.get("success") and data.get("result"):
                     for entry in data["result"]:
                         src = entry.get("sources", ["Unknown"])
                         for s in src:
-                            if not any(x["name"] == s for x in all_breaches):
-                                all_breaches.append({
-                                    "name": s,
-                                    "has_password": entry.get("has_password", False),
-                                    "source": "BreachDirectory",
-                                })
+                            breaches.append({
+                                "name": s,
+                                "has_password": entry.get("has_password", False),
+                                "source": "BreachDirectory",
+                            })
         except Exception as e:
             logger.debug(f"BreachDirectory check failed: {e}")
+        return breaches
 
-        # 4. LeakCheck (free tier — 10 req/day)
+    def _check_leakcheck(self, email: str, quoted: str) -> List[Dict]:
+        """LeakCheck (free tier — 10 req/day)."""
+        breaches = []
         leakcheck_key = self.config.get("LEAKCHECK_API_KEY", "")
-        if leakcheck_key:
-            try:
-                resp = self.http.get(
-                    f"https://leakcheck.io/api/public?check={email}",
-                    headers={"X-API-Key": leakcheck_key},
-                )
-                if resp and resp.status_code == 200:
-                    data = resp.json()
-                    if data.get("success") and data.get("sources"):
-                        for s in data["sources"]:
-                            name = s.get("name", "Unknown")
-                            if not any(x["name"] == name for x in all_breaches):
-                                all_breaches.append({
-                                    "name": name,
-                                    "date": s.get("date", ""),
-                                    "source": "LeakCheck",
-                                })
-            except Exception as e:
-                logger.debug(f"LeakCheck check failed: {e}")
+        if not leakcheck_key:
+            return breaches
+        try:
+            resp = self.http.get(
+                f"https://leakcheck.io/api/public?check={quoted}",
+                headers={"X-API-Key": leakcheck_key},
+            )
+            if resp and resp.status_code == 200:
+                data = self.http.json(resp)
+                if data.get("success") and data.get("sources"):
+                    for s in data["sources"]:
+                        breaches.append({
+                            "name": s.get("name", "Unknown"),
+                            "date": s.get("date", ""),
+                            "source": "LeakCheck",
+                        })
+        except Exception as e:
+            logger.debug(f"LeakCheck check failed: {e}")
+        return breaches
 
-        # 5. EmailRep.io (free, no key — reputation scoring)
+    def _check_emailrep(self, email: str, quoted: str) -> List[Dict]:
+        """EmailRep.io (free, no key — reputation scoring)."""
+        breaches = []
         try:
             resp = self.http.get(
-                f"https://emailrep.io/{email}",
+                f"https://emailrep.io/{quoted}",
                 headers={"User-Agent": "EireScope-OSINT"},
             )
             if resp and resp.status_code == 200:
-                data = resp.json()
+                data = self.http.json(resp)
                 if data.get("details", {}).get("credentials_leaked"):
-                    all_breaches.append({
+                    breaches.append({
                         "name": "EmailRep Credential Leak",
                         "reputation": data.get("reputation", ""),
                         "suspicious": data.get("suspicious", False),
@@ -307,22 +383,36 @@ class EmailModule(BaseOSINTModule):
                 }
         except Exception as e:
             logger.debug(f"EmailRep check failed: {e}")
-
-        return all_breaches
+        return breaches
 
     def _check_gravatar(self, email: str) -> Optional[Dict]:
-        """Check for Gravatar profile associated with email."""
-        import hashlib
-        email_hash = hashlib.md5(email.lower().encode()).hexdigest()
+        """Check for Gravatar profile associated with a normalized email."""
+        cached = _gravatar_cache.get(email, _MISS)
+        if cached is not _MISS:
+            return cached
+        email_hash = hashlib.sha256(email.encode()).hexdigest()
         url = f"https://www.gravatar.com/avatar/{email_hash}?d=404"
+        # Revalidate a previously seen avatar: the CDN answers 304 with no body
+        etag = _gravatar_etags.get(email_hash)
+        headers = {"If-None-Match": etag} if etag else None
         try:
-            resp = self.http.head(url)
-            if resp and resp.status_code == 200:
-                return {
+            resp = self.http.head(url, headers=headers)
+            if resp is None:
+                return None
+            result = None
+            if resp.status_code in (200, 304):
+                result = {
                     "has_gravatar": True,
                     "avatar_url": f"https://www.gravatar.com/avatar/{email_hash}",
                     "profile_url": f"https://gravatar.com/{email_hash}",
                 }
+                if resp.headers.get("ETag"):
+                    _gravatar_etags.set(email_hash, resp.headers["ETag"])
+            elif resp.status_code == 404:
+                _gravatar_etags.pop(email_hash)
+            if resp.status_code in (200, 304, 404):
+                _gravatar_cache.set(email, result)
+            return result
         except Exception:
             pass
         return None
@@ -1,15 +1,93 @@
 """IP Address OSINT Module — WHOIS, geolocation, DNS reverse lookup."""
 import re
 import socket
-import subprocess
 import logging
+import ipaddress
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
+import dns.resolver
+import dns.reversename
 from eirescope.core.entity import Entity, EntityType, Investigation
 from eirescope.modules.base import BaseOSINTModule
-from eirescope.utils.http_client import OSINTHTTPClient
+from eirescope.utils.http_client import get_shared_client
+from eirescope.utils import whois_client
+from eirescope.utils.domains import registrable_domain
+from eirescope.utils.cache import TTLCache
 
 logger = logging.getLogger("eirescope.modules.ip")
 
+# Long-lived resolver for PTR fallbacks; parses resolv.conf once
+_resolver = dns.resolver.Resolver()
+
+# Per-IP results shared across investigations (repeat IPs, NAT gateways, shared
+# hosting); ip-api.com throttles at 45 req/min. TTLs are overridable via config.
+_geo_cache = TTLCache(maxsize=10000, ttl=12 * 3600)
+_rdns_cache = TTLCache(maxsize=10000, ttl=15 * 60)
+_whois_cache = TTLCache(maxsize=10000, ttl=24 * 3600)
+_MISS = object()
+
+# (our key, ip-api.com field, default). The field list is also sent as
+# `fields=`, so ip-api returns exactly these — including mobile/proxy/hosting,
+# which are omitted from its default response.
+_GEO_FIELDS = (
+    ("country", "country", ""),
+    ("country_code", "countryCode", ""),
+    ("region", "regionName", ""),
+    ("city", "city", ""),
+    ("zip", "zip", ""),
+    ("lat", "lat", None),
+    ("lon", "lon", None),
+    ("timezone", "timezone", ""),
+    ("isp", "isp", ""),
+    ("org", "org", ""),
+    ("as", "as", ""),
+    ("is_mobile", "mobile", False),
+    ("is_proxy", "proxy", False),
+    ("is_hosting", "hosting", False),
+)
+_GEO_QUERY_FIELDS = ",".join(["status", "query"] + [api for _, api, _ in _GEO_FIELDS])
+
+# "tag: value" WHOIS line (the RFC 3912 pseudo-standard RIRs follow)
+_WHOIS_LINE = re.compile(r"[ \t]*([A-Za-z][\w\-]*)[ \t]*:[ \t]*(.*)")
+
+# Lowercased tag -> stable field name across ARIN and RIPE-style spellings
+_WHOIS_FIELDS = {
+    "netname": "netname",
+    "orgname": "org_name",
+    "org-name": "org_name",
+    "organisation": "org_name",
+    "country": "country",
+    "address": "address",
+    "cidr": "cidr",
+    "inetnum": "cidr",
+    "orgabuseemail": "abuse_email",
+    "abuse-mailbox": "abuse_email",
+    "regdate": "created",
+    "created": "created",
+    "updated": "updated",
+    "last-modified": "updated",
+}
+_WHOIS_TOKEN_FIELDS = frozenset({"country", "abuse_email"})  # keep the first word only
+
+
+@functools.lru_cache(maxsize=4096)
+def _special_range(ip: str) -> Optional[str]:
+    """Label for loopback/link-local/private/multicast addresses (IPv4 and IPv6), else None."""
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return None
+    if addr.is_loopback:
+        return "loopback"
+    if addr.is_link_local:
+        return "link-local"
+    if addr.is_private:
+        return "private"
+    if addr.is_multicast:
+        return "multicast"
+    return None
+
 
 class IPModule(BaseOSINTModule):
     """IP address reconnaissance — WHOIS, GeoIP, reverse DNS."""
@@ -22,7 +100,10 @@ class IPModule(BaseOSINTModule):
 
     def __init__(self, config=None):
         super().__init__(config)
-        self.http = OSINTHTTPClient(timeout=10, max_retries=2, rate_limit=0.5)
+        self.http = get_shared_client(timeout=10, max_retries=2, rate_limit=0.5)
+        self._geo_ttl = self.config.get("IP_GEO_CACHE_TTL", _geo_cache.ttl)
+        self._rdns_ttl = self.config.get("IP_RDNS_CACHE_TTL", _rdns_cache.ttl)
+        self._whois_ttl = self.config.get("IP_WHOIS_CACHE_TTL", _whois_cache.ttl)
 
     def execute(self, entity: Entity, investigation: Investigation) -> List[Entity]:
         """Run IP address reconnaissance."""
@@ -30,8 +111,25 @@ class IPModule(BaseOSINTModule):
         logger.info(f"Analyzing IP address: {ip}")
         found_entities = []
 
+        # Non-routable addresses have no GeoIP, public PTR or RIR record:
+        # skip the lookups rather than spend ip-api quota on them
+        special = _special_range(ip)
+        if special:
+            entity.metadata["ip_type"] = special
+            logger.info(f"IP {ip} is {special}; skipping external lookups")
+            return found_entities
+
+        # GeoIP, reverse DNS and WHOIS are independent network calls: run them
+        # together, then build entities in the usual order
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            geo_future = executor.submit(self._geoip_lookup, ip)
+            rdns_future = executor.submit(self._reverse_dns, ip)
+            whois_future = executor.submit(self._whois_lookup, ip)
+            geo_data = geo_future.result()
+            rdns = rdns_future.result()
+            whois_data = whois_future.result()
+
         # 1. GeoIP Lookup (free API)
-        geo_data = self._geoip_lookup(ip)
         if geo_data:
             entity.metadata["geolocation"] = geo_data
             if geo_data.get("country"):
@@ -57,7 +155,6 @@ class IPModule(BaseOSINTModule):
                 entity.metadata["organization"] = geo_data.get("org", "")
 
         # 2. Reverse DNS
-        rdns = self._reverse_dns(ip)
         if rdns:
             entity.metadata["reverse_dns"] = rdns
             # Extract domain from reverse DNS
@@ -80,7 +177,6 @@ class IPModule(BaseOSINTModule):
                 found_entities.append(added)
 
         # 3. WHOIS
-        whois_data = self._whois_lookup(ip)
         if whois_data:
             entity.metadata["whois"] = whois_data
             whois_entity = Entity(
@@ -106,95 +202,101 @@ class IPModule(BaseOSINTModule):
         return found_entities
 
     def _geoip_lookup(self, ip: str) -> Optional[Dict]:
-        """GeoIP lookup using free ip-api.com service."""
+        """GeoIP lookup using free ip-api.com service (cached per IP)."""
+        cached = _geo_cache.get(ip)
+        if cached is not None:
+            return dict(cached)
         try:
             resp = self.http.get(
                 f"http://ip-api.com/json/{ip}",
                 headers={"Accept": "application/json"},
+                params={"fields": _GEO_QUERY_FIELDS},
             )
             if resp and resp.status_code == 200:
-                data = resp.json()
-                if data.get("status") == "success":
-                    return {
-                        "ip": ip,
-                        "country": data.get("country", ""),
-                        "country_code": data.get("countryCode", ""),
-                        "region": data.get("regionName", ""),
-                        "city": data.get("city", ""),
-                        "zip": data.get("zip", ""),
-                        "lat": data.get("lat"),
-                        "lon": data.get("lon"),
-                        "timezone": data.get("timezone", ""),
-                        "isp": data.get("isp", ""),
-                        "org": data.get("org", ""),
-                        "as": data.get("as", ""),
-                        "is_mobile": data.get("mobile", False),
-                        "is_proxy": data.get("proxy", False),
-                        "is_hosting": data.get("hosting", False),
-                    }
+                result = self._format_geo(ip, self.http.json(resp))
+                if result:
+                    return dict(result)
         except Exception as e:
             logger.debug(f"GeoIP lookup failed for {ip}: {e}")
         return None
 
+    def _format_geo(self, ip: str, data: Dict) -> Optional[Dict]:
+        """Shape one ip-api.com answer and cache it; None unless successful."""
+        if data.get("status") != "success":
+            return None
+        result = {"ip": ip}
+        for key, field, default in _GEO_FIELDS:
+            result[key] = data.get(field, default)
+        _geo_cache.set(ip, result, self._geo_ttl)
+        return result
+
     def _reverse_dns(self, ip: str) -> Optional[str]:
-        """Perform reverse DNS lookup."""
+        """Perform reverse DNS lookup (cached per IP, including definite misses)."""
+        cached = _rdns_cache.get(ip, _MISS)
+        if cached is not _MISS:
+            return cached
+        hostname = self._resolve_ptr(ip)
+        if hostname is _MISS:
+            return None  # resolver error or timeout: retry on the next lookup
+        _rdns_cache.set(ip, hostname, self._rdns_ttl)
+        return hostname
+
+    def _resolve_ptr(self, ip: str):
+        """PTR name, None if the IP has no PTR record, or _MISS if the lookup failed."""
         try:
             hostname, _, _ = socket.gethostbyaddr(ip)
             return hostname
         except (socket.herror, socket.gaierror, OSError):
             pass
-        # Fallback: use dig
+        # Fallback: query the PTR record directly
         try:
-            result = subprocess.run(
-                ["dig", "+short", "-x", ip],
-                capture_output=True, text=True, timeout=10,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return result.stdout.strip().rstrip(".")
-        except Exception:
-            pass
-        return None
+            answer = _resolver.resolve(dns.reversename.from_address(ip), "PTR", lifetime=5)
+            return answer[0].to_text().rstrip(".")
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            return None
+        except Exception as e:
+            logger.debug(f"PTR lookup failed for {ip}: {e}")
+            return _MISS
 
     def _whois_lookup(self, ip: str) -> Optional[Dict]:
-        """WHOIS lookup using system whois command."""
+        """WHOIS lookup against the responsible RIR (cached per IP)."""
+        cached = _whois_cache.get(ip)
+        if cached is not None:
+            return dict(cached)
         try:
-            result = subprocess.run(
-                ["whois", ip],
-                capture_output=True, text=True, timeout=15,
-            )
-            if result.returncode == 0 and result.stdout:
-                return self._parse_whois(result.stdout)
-        except FileNotFoundError:
-            logger.debug("whois command not found")
+            raw = whois_client.lookup_ip(ip, timeout=15)
+            if raw:
+                result = self._parse_whois(raw)
+                _whois_cache.set(ip, result, self._whois_ttl)
+                return dict(result)
         except Exception as e:
             logger.debug(f"WHOIS lookup failed for {ip}: {e}")
         return None
 
     def _parse_whois(self, raw: str) -> Dict:
-        """Parse raw WHOIS output into structured data."""
+        """Parse raw WHOIS output into structured data.
+
+        Every tag is kept under its lowercased name (first value wins); the
+        common ones are also exposed under stable keys such as `org_name`.
+        """
         data = {"raw": raw[:2000]}  # Keep truncated raw
-        patterns = {
-            "netname": r"(?:NetName|netname):\s*(.+)",
-            "org_name": r"(?:OrgName|org-name|organisation):\s*(.+)",
-            "country": r"(?:Country|country):\s*(\S+)",
-            "address": r"(?:Address|address):\s*(.+)",
-            "cidr": r"(?:CIDR|inetnum):\s*(.+)",
-            "abuse_email": r"(?:OrgAbuseEmail|abuse-mailbox):\s*(\S+)",
-            "created": r"(?:RegDate|created):\s*(.+)",
-            "updated": r"(?:Updated|last-modified):\s*(.+)",
-        }
-        for key, pattern in patterns.items():
-            match = re.search(pattern, raw, re.IGNORECASE)
-            if match:
-                data[key] = match.group(1).strip()
+        for line in raw.splitlines():
+            match = _WHOIS_LINE.match(line)
+            if not match:
+                continue
+            value = match.group(2).strip()
+            if not value:
+                continue
+            tag = match.group(1).lower()
+            key = _WHOIS_FIELDS.get(tag)
+            if key and key not in data:
+                data[key] = value.split()[0] if key in _WHOIS_TOKEN_FIELDS else value
+            data.setdefault(tag, value)
         return data
 
     def _extract_domain(self, hostname: str) -> Optional[str]:
         """Extract registrable domain from hostname."""
-        parts = hostname.rstrip(".").split(".")
-        if len(parts) >= 2:
-            return ".".join(parts[-2:])
-        return None
+        return registrable_domain(hostname)
 
     def _classify_ip(self, ip: str, geo_data: Optional[Dict] = None) -> str:
         """Classify IP as residential, hosting, VPN, etc."""
@@ -206,13 +308,8 @@ class IPModule(BaseOSINTModule):
             if geo_data.get("is_mobile"):
                 return "mobile"
 
-        # Check private ranges
-        if ip.startswith(("10.", "172.16.", "172.17.", "172.18.", "172.19.",
-                          "172.20.", "172.21.", "172.22.", "172.23.", "172.24.",
-                          "172.25.", "172.26.", "172.27.", "172.28.", "172.29.",
-                          "172.30.", "172.31.", "192.168.")):
-            return "private"
-        if ip.startswith("127."):
-            return "loopback"
+        special = _special_range(ip)
+        if special:
+            return special
 
         return "residential/unknown"
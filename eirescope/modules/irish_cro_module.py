@@ -2,20 +2,77 @@
 import logging
 import base64
 import os
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from eirescope.core.entity import Entity, EntityType, Investigation
 from eirescope.modules.base import BaseOSINTModule
-from eirescope.utils.http_client import OSINTHTTPClient
+from eirescope.utils.http_client import get_shared_client
+from eirescope.utils.cache import TTLCache
+from eirescope.utils import serialization
 
 logger = logging.getLogger("eirescope.modules.irish_cro")
 
 # CRO Open Data Portal — CKAN API (individual company records)
 CRO_CKAN_BASE = "https://opendata.cro.ie/api/3/action"
-CRO_COMPANY_RESOURCE = "3fef41bc-b8f4-4b10-8434-ce51c29b1bba"
+# Company register datastore resources, newest first; the portal has
+# republished the register under new ids before
+CRO_COMPANY_RESOURCES = (
+    "3fef41bc-b8f4-4b10-8434-ce51c29b1bba",
+    "e64eb540-fb97-44c2-b461-766f2babbdf6",
+)
+CKAN_MAX_RECORDS = 15
+
+# datastore_search_sql takes no bind parameters, so the query is escaped into
+# a fixed template: quotes doubled, LIKE wildcards and backslash made literal.
+_SQL_NAME_SEARCH = (
+    'SELECT * FROM "{resource}" '
+    "WHERE \"company_name\" ILIKE '%{pattern}%' "
+    f"LIMIT {CKAN_MAX_RECORDS}"
+)
+_SQL_LIKE_ESCAPE = str.maketrans({"'": "''", "\\": "\\\\", "%": "\\%", "_": "\\_"})
 
 # CRO Company Web Services (CWS) — RESTful API
 CRO_CWS_BASE = "https://services.cro.ie/cws"
 
+# Canonical field -> spellings seen across the CKAN resource versions and CWS
+_CKAN_ALIASES = {
+    "company_name": ("company_name", "Company Name", "company_name_english"),
+    "company_num": ("company_num", "Company Number", "company_number"),
+    "company_status": ("company_status", "company_status_desc", "status"),
+    "company_type": ("company_type_desc", "company_type", "type"),
+    "address_1": ("company_addr_1", "company_address_1"),
+    "address_2": ("company_addr_2", "company_address_2"),
+    "address_3": ("company_addr_3", "company_address_3"),
+    "address_4": ("company_addr_4", "company_address_4"),
+    "county": ("County", "county"),
+}
+
+
+_NAME_PUNCT = str.maketrans("", "", ".,'\"()&-")
+
+
+def _name_key(name: str) -> str:
+    """Comparison key for company names: case, punctuation and spacing ignored."""
+    return " ".join(name.lower().translate(_NAME_PUNCT).split())
+
+
+def _pick(record: Dict, key: str, default=""):
+    """First non-empty value among a canonical field's aliases."""
+    for alias in _CKAN_ALIASES[key]:
+        value = record.get(alias)
+        if value not in (None, ""):
+            return value
+    return default
+
+
+# Resource that last answered; tried first by every search
+_active_resource = CRO_COMPANY_RESOURCES[0]
+
+# (source, normalized query) -> records; the register changes slowly and the
+# portal is rate-limited. Empty results are not cached (they may be errors).
+_cro_cache = TTLCache(maxsize=4096, ttl=24 * 3600)
+
 # Test credentials (limited to 'ryanair', 'google', company_num 83740)
 CRO_TEST_EMAIL = "[email protected]"
 CRO_TEST_KEY = "da093a04-c9d7-46d7-9c83-9c9f8630d5e0"
@@ -32,45 +89,46 @@ class IrishCROModule(BaseOSINTModule):
 
     def __init__(self, config=None):
         super().__init__(config)
-        self.http = OSINTHTTPClient(timeout=15, max_retries=2, rate_limit=0.5)
+        self.http = get_shared_client(timeout=15, max_retries=2, rate_limit=0.5)
         # CWS API credentials (optional — falls back to test creds)
         self.cws_email = os.environ.get("CRO_EMAIL", "")
         self.cws_key = os.environ.get("CRO_API_KEY", "")
-
-    def _get_cws_auth_header(self) -> Dict[str, str]:
-        """Build Basic Auth header for CWS API."""
+        # Credentials are fixed for the instance: build the Basic Auth header once
         email = self.cws_email or CRO_TEST_EMAIL
         key = self.cws_key or CRO_TEST_KEY
         token = base64.b64encode(f"{email}:{key}".encode()).decode()
-        return {"Authorization": f"Basic {token}", "Accept": "application/json"}
+        self._cws_auth_header = {"Authorization": f"Basic {token}", "Accept": "application/json"}
 
     def execute(self, entity: Entity, investigation: Investigation) -> List[Entity]:
         """Search CRO for company/person data."""
         query = entity.value
         logger.info(f"CRO lookup for: {query}")
         found_entities = []
+        seen_names = set()  # _name_key of found_entities, for dedup across sources
 
         # For domains, extract the name part (e.g., "acme" from "acme.ie")
         if entity.entity_type == EntityType.DOMAIN:
             query = query.split(".")[0]
 
+        # CWS is independent of the open data portal: query it alongside. The
+        # SQL search is only a fallback for an empty full-text search, and it
+        # runs after that search has settled on a working resource.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            cws_future = executor.submit(self._cached_search, "cws", self._search_cws, query)
+            ckan_results = self._cached_search("ckan", self._search_ckan, query)
+            sql_results = []
+            if not ckan_results:
+                resource = _active_resource
+                sql_results = self._cached_search(
+                    "ckan_sql", lambda q: self._search_ckan_sql(q, resource), query)
+            cws_results = cws_future.result()
+
         # 1. Search CRO Open Data (CKAN API — full company register)
-        ckan_results = self._search_ckan(query)
         if ckan_results:
             entity.metadata["cro_ckan_results"] = len(ckan_results)
             for company in ckan_results[:10]:
-                comp_name = (
-                    company.get("company_name")
-                    or company.get("Company Name")
-                    or company.get("company_name_english")
-                    or "Unknown"
-                )
-                comp_num = str(
-                    company.get("company_num")
-                    or company.get("Company Number")
-                    or company.get("company_number")
-                    or ""
-                )
+                comp_name = _pick(company, "company_name", "Unknown")
+                comp_num = str(_pick(company, "company_num"))
                 company_entity = Entity(
                     entity_type=EntityType.COMPANY,
                     value=comp_name,
@@ -79,13 +137,13 @@ class IrishCROModule(BaseOSINTModule):
                     metadata={
                         "company_number": comp_num,
                         "company_name": comp_name,
-                        "company_status": company.get("company_status", company.get("company_status_desc", "")),
-                        "company_type": company.get("company_type_desc", company.get("company_type", "")),
-                        "registered_address": company.get("company_addr_1", company.get("company_address_1", "")),
-                        "address_2": company.get("company_addr_2", company.get("company_address_2", "")),
-                        "address_3": company.get("company_addr_3", company.get("company_address_3", "")),
-                        "address_4": company.get("company_addr_4", company.get("company_address_4", "")),
-                        "county": company.get("County", company.get("county", "")),
+                        "company_status": _pick(company, "company_status"),
+                        "company_type": _pick(company, "company_type"),
+                        "registered_address": _pick(company, "address_1"),
+                        "address_2": _pick(company, "address_2"),
+                        "address_3": _pick(company, "address_3"),
+                        "address_4": _pick(company, "address_4"),
+                        "county": _pick(company, "county"),
                         "registration_date": company.get("company_reg_date", ""),
                         "last_annual_return": company.get("last_arr_date", ""),
                         "last_accounts_date": company.get("last_accounts_date", ""),
@@ -103,54 +161,49 @@ class IrishCROModule(BaseOSINTModule):
                     evidence={"query": query, "company_number": comp_num},
                 )
                 found_entities.append(added)
+                seen_names.add(_name_key(added.value))
 
         # 2. Also try CKAN SQL search for more flexible matching
-        if not ckan_results:
-            sql_results = self._search_ckan_sql(query)
-            if sql_results:
-                entity.metadata["cro_sql_results"] = len(sql_results)
-                for company in sql_results[:10]:
-                    comp_name = (
-                        company.get("company_name")
-                        or company.get("Company Name")
-                        or "Unknown"
-                    )
-                    # Skip if already found
-                    if any(e.value == comp_name for e in found_entities):
-                        continue
-                    comp_num = str(company.get("company_num", company.get("Company Number", "")))
-                    company_entity = Entity(
-                        entity_type=EntityType.COMPANY,
-                        value=comp_name,
-                        source_module=self.name,
-                        confidence=0.80,
-                        metadata={
-                            "company_number": comp_num,
-                            "company_name": comp_name,
-                            "company_status": company.get("company_status", ""),
-                            "county": company.get("County", ""),
-                            "source": "CRO Open Data (SQL)",
-                            "cro_url": f"https://core.cro.ie/company/{comp_num}" if comp_num else "",
-                        },
-                    )
-                    added = investigation.add_entity(company_entity)
-                    investigation.add_relationship(
-                        source_id=entity.id,
-                        target_id=added.id,
-                        rel_type="cro_company_record",
-                        confidence=0.80,
-                    )
-                    found_entities.append(added)
+        if sql_results and not ckan_results:
+            entity.metadata["cro_sql_results"] = len(sql_results)
+            for company in sql_results[:10]:
+                comp_name = _pick(company, "company_name", "Unknown")
+                # Skip if already found
+                if _name_key(comp_name) in seen_names:
+                    continue
+                comp_num = str(_pick(company, "company_num"))
+                company_entity = Entity(
+                    entity_type=EntityType.COMPANY,
+                    value=comp_name,
+                    source_module=self.name,
+                    confidence=0.80,
+                    metadata={
+                        "company_number": comp_num,
+                        "company_name": comp_name,
+                        "company_status": _pick(company, "company_status"),
+                        "county": _pick(company, "county"),
+                        "source": "CRO Open Data (SQL)",
+                        "cro_url": f"https://core.cro.ie/company/{comp_num}" if comp_num else "",
+                    },
+                )
+                added = investigation.add_entity(company_entity)
+                investigation.add_relationship(
+                    source_id=entity.id,
+                    target_id=added.id,
+                    rel_type="cro_company_record",
+                    confidence=0.80,
+                )
+                found_entities.append(added)
+                seen_names.add(_name_key(added.value))
 
         # 3. Try CWS API (services.cro.ie) — requires API key or test mode
-        cws_results = self._search_cws(query)
         if cws_results:
             entity.metadata["cro_cws_results"] = len(cws_results)
             for company in cws_results[:5]:
-                name = company.get("company_name", "")
-                if not name or any(e.value == name for e in found_entities):
+                name = _pick(company, "company_name")
+                if not name or _name_key(name) in seen_names:
                     continue
-                comp_num = str(company.get("company_num", ""))
+                comp_num = str(_pick(company, "company_num"))
                 company_entity = Entity(
                     entity_type=EntityType.COMPANY,
                     value=name,
@@ -159,9 +212,9 @@ class IrishCROModule(BaseOSINTModule):
                     metadata={
                         "company_number": comp_num,
                         "company_name": name,
-                        "company_status": company.get("company_status_desc", company.get("status", "")),
-                        "company_type": company.get("company_type_desc", company.get("type", "")),
-                        "registered_address": company.get("company_addr_1", ""),
+                        "company_status": _pick(company, "company_status"),
+                        "company_type": _pick(company, "company_type"),
+                        "registered_address": _pick(company, "address_1"),
                         "source": "CRO CWS API",
                         "cro_url": f"https://core.cro.ie/company/{comp_num}" if comp_num else "",
                     },
@@ -174,6 +227,7 @@ class IrishCROModule(BaseOSINTModule):
                     confidence=0.90,
                 )
                 found_entities.append(added)
+                seen_names.add(_name_key(added.value))
 
         if not found_entities:
             entity.metadata["cro_note"] = (
@@ -186,61 +240,95 @@ class IrishCROModule(BaseOSINTModule):
         logger.info(f"CRO lookup complete: {len(found_entities)} companies found")
         return found_entities
 
+    def _cached_search(self, source: str, search, query: str) -> List[Dict]:
+        """Run one source's search, serving repeat queries from the shared cache."""
+        key = (source, " ".join(query.lower().split()))
+        records = _cro_cache.get(key)
+        if records is None:
+            records = search(query)
+            if records:
+                _cro_cache.set(key, records)
+        return records
+
     # ── CKAN full-text search ──────────────────────────────────────────
 
     def _search_ckan(self, query: str) -> List[Dict]:
-        """Search CRO Open Data Portal via CKAN datastore full-text search."""
-        try:
-            resp = self.http.get(
-                f"{CRO_CKAN_BASE}/datastore_search",
-                params={
-                    "resource_id": CRO_COMPANY_RESOURCE,
-                    "q": query,
-                    "limit": 15,
-                },
-            )
-            if resp and resp.status_code == 200:
-                data = resp.json()
-                if data.get("success"):
-                    records = data.get("result", {}).get("records", [])
+        """Search CRO Open Data Portal via CKAN datastore full-text search.
+
+        Candidate resources are tried in turn (last working one first); a 404
+        means the resource id is gone and the next one is tried.
+        """
+        global _active_resource
+        resources = (_active_resource,) + tuple(r for r in CRO_COMPANY_RESOURCES if r != _active_resource)
+        for resource in resources:
+            try:
+                resp = self.http.get(
+                    f"{CRO_CKAN_BASE}/datastore_search",
+                    params={
+                        "resource_id": resource,
+                        "q": query,
+                        "limit": CKAN_MAX_RECORDS,
+                    },
+                    stream=True,
+                )
+                # Not `if resp`: Response.__bool__ is False for 4xx/5xx
+                if resp is None:
+                    break
+                if resp.status_code == 200:
+                    _active_resource = resource
+                    records = self._read_records(resp)
                     if records:
                         logger.info(f"CKAN search returned {len(records)} records")
                         return records
-                    else:
-                        logger.info("CKAN search returned 0 records")
-            elif resp:
+                    logger.info("CKAN search returned 0 records")
+                    break
+                resp.close()
+                if resp.status_code == 404:
+                    logger.info(f"CKAN resource {resource} not found, trying next")
+                    continue
                 logger.warning(f"CKAN returned status {resp.status_code}")
-        except Exception as e:
-            logger.warning(f"CKAN search failed: {e}")
+                break
+            except Exception as e:
+                logger.warning(f"CKAN search failed: {e}")
+                break
         return []
 
-    def _search_ckan_sql(self, query: str) -> List[Dict]:
-        """Search CKAN using SQL API for flexible LIKE matching."""
+    def _search_ckan_sql(self, query: str, resource: str) -> List[Dict]:
+        """Search one CKAN resource using the SQL API for flexible LIKE matching."""
         try:
-            # Escape single quotes in query
-            safe_q = query.replace("'", "''")
-            sql = (
-                f'SELECT * FROM "{CRO_COMPANY_RESOURCE}" '
-                f"WHERE \"company_name\" ILIKE '%{safe_q}%' "
-                f"LIMIT 15"
-            )
+            sql = _SQL_NAME_SEARCH.format(resource=resource,
+                                          pattern=query.translate(_SQL_LIKE_ESCAPE))
             resp = self.http.get(
                 f"{CRO_CKAN_BASE}/datastore_search_sql",
                 params={"sql": sql},
+                stream=True,
             )
-            if resp and resp.status_code == 200:
-                data = resp.json()
-                if data.get("success"):
-                    records = data.get("result", {}).get("records", [])
+            if resp is None:
+                return []
+            try:
+                if resp.status_code == 200:
+                    records = self._read_records(resp)
                     if records:
                         logger.info(f"CKAN SQL search returned {len(records)} records")
                         return records
-            elif resp:
-                logger.warning(f"CKAN SQL returned status {resp.status_code}")
+                else:
+                    logger.warning(f"CKAN SQL returned status {resp.status_code}")
+            finally:
+                resp.close()
         except Exception as e:
             logger.warning(f"CKAN SQL search failed: {e}")
         return []
 
+    def _read_records(self, resp) -> List[Dict]:
+        """Stream `result.records` out of a CKAN response, stopping after
+        CKAN_MAX_RECORDS even if the server ignored the limit. Failed calls
+        (`"success": false`) carry no records and yield an empty list."""
+        try:
+            records = serialization.iter_json_array(resp.iter_content(chunk_size=65536), key="records")
+            return list(islice(records, CKAN_MAX_RECORDS))
+        finally:
+            resp.close()
+
     # ── CWS REST API ───────────────────────────────────────────────────
 
     def _search_cws(self, query: str) -> List[Dict]:
@@ -255,10 +343,10 @@ class IrishCROModule(BaseOSINTModule):
                     "max": 10,
                     "htmlEnc": "false",
                 },
-                headers=self._get_cws_auth_header(),
+                headers=self._cws_auth_header,
             )
             if resp and resp.status_code == 200:
-                data = resp.json()
+                data = self.http.json(resp)
                 # CWS returns a list or an object with companies
                 if isinstance(data, list):
                     logger.info(f"CWS returned {len(data)} companies")
@@ -1,12 +1,16 @@
 """Phone Number OSINT Module — Validation, carrier detection, geolocation."""
-import re
 import logging
-from typing import List, Dict, Optional
+import functools
+from types import MappingProxyType
+from typing import List, Dict, Optional, Tuple
 from eirescope.core.entity import Entity, EntityType, Investigation
 from eirescope.modules.base import BaseOSINTModule
 
 logger = logging.getLogger("eirescope.modules.phone")
 
+# Separators deleted during normalization (one C-level str.translate pass)
+_PHONE_DELETE = str.maketrans("", "", " \t\r\n\v\f\u00a0-().")
+
 # Irish carrier prefixes (mobile)
 IRISH_CARRIERS = {
     "083": "Three Ireland",
@@ -41,6 +45,117 @@ COUNTRY_CODES = {
     "61": {"country": "Australia", "iso": "AU", "name": "Australia"},
 }
 
+# Records are shared read-only views; callers get a dict copy because the
+# record ends up in entity metadata, which is merged into and serialized
+COUNTRY_CODES = {code: MappingProxyType(info) for code, info in COUNTRY_CODES.items()}
+
+# Country codes split by length, tried longest first
+_CC3 = {k: v for k, v in COUNTRY_CODES.items() if len(k) == 3}
+_CC2 = {k: v for k, v in COUNTRY_CODES.items() if len(k) == 2}
+_CC1 = {k: v for k, v in COUNTRY_CODES.items() if len(k) == 1}
+
+# Two digits after +353 -> (carrier, 0-prefixed prefix)
+_IRISH_CARRIER_BY_DIGITS = {prefix[1:]: (carrier, prefix) for prefix, carrier in IRISH_CARRIERS.items()}
+
+
+def _prefix_table(groups: Dict[str, tuple]) -> Dict[str, str]:
+    return {prefix: label for label, prefixes in groups.items() for prefix in prefixes}
+
+
+# Irish national number (after +353) -> number type. Four-digit service
+# prefixes are checked before the two-digit area/mobile codes, but only for
+# 10-digit numbers (1800 xxx xxx): Dublin numbers (1 + 7 digits) such as
+# 01 800 xxxx share the leading digits.
+_IE_PREFIX4 = _prefix_table({
+    "toll-free": ("1800",),
+    "shared-cost": ("1850", "1890"),
+})
+_IE_PREFIX2 = _prefix_table({
+    "landline (Munster)": ("21", "22", "23", "24", "25", "26", "27", "28", "29"),
+    "landline (Leinster/Ulster)": ("41", "42", "43", "44", "45", "46", "47", "49"),
+    "landline (South-East)": ("51", "52", "53", "54", "56", "57", "58", "59"),
+    "landline (Mid-West/Kerry)": ("61", "62", "63", "64", "65", "66", "67", "68", "69"),
+    "landline (West/North-West)": ("71", "74", "76", "90", "91", "93", "94", "95", "96", "97", "98", "99"),
+    "mobile": ("83", "85", "86", "87", "89"),
+})
+
+
+def _analyze(phone: str) -> Dict:
+    """Country, carrier, number type and Irish checks in one pass over the digits."""
+    digits = phone.lstrip("+")
+    # Try 3-digit codes first, then 2-digit, then 1-digit
+    info = _CC3.get(digits[:3]) or _CC2.get(digits[:2]) or _CC1.get(digits[:1])
+    result = {
+        "country": dict(info) if info else None,
+        "carrier": None,
+        "number_type": "unknown",
+        "irish_analysis": None,
+    }
+    if not digits.startswith("353"):
+        return result
+
+    local = digits[3:]
+    hit = _IRISH_CARRIER_BY_DIGITS.get(local[:2])
+    if hit:
+        carrier, prefix = hit
+        result["carrier"] = {
+            "carrier": carrier,
+            "prefix": prefix,
+            "type": "mobile",
+            "country": "Ireland",
+        }
+    result["number_type"] = (
+        (len(local) == 10 and _IE_PREFIX4.get(local[:4]))
+        or _IE_PREFIX2.get(local[:2])
+        or ("landline (Dublin)" if local.startswith("1") else "unknown")
+    )
+
+    analysis = {
+        "is_irish": True,
+        "local_number": "0" + local,
+        "international_format": phone,
+    }
+    # Check if it's a premium rate number
+    if local.startswith("15"):
+        analysis["warning"] = "Premium rate number"
+        analysis["risk_level"] = "high"
+    # Check for known VoIP ranges
+    if local.startswith("76"):
+        analysis["note"] = "VoIP number range — may be harder to trace"
+        analysis["is_voip"] = True
+    result["irish_analysis"] = analysis
+    return result
+
+
+def _is_e164(phone: str) -> bool:
+    """Validate E.164 format: "+" followed by 7-15 digits, no regex needed."""
+    return 8 <= len(phone) <= 16 and phone[0] == "+" and phone[1:].isdecimal()
+
+
+@functools.lru_cache(maxsize=4096)
+def _pure_analyze(phone: str) -> Tuple[str, Optional[Dict], Optional[Dict], str, bool, Optional[Dict]]:
+    """Normalize and analyze a raw number; returns
+    (cleaned, country, carrier, number_type, is_valid, irish_analysis).
+
+    Cached per raw string, so callers must copy the dicts before storing them.
+    """
+    cleaned = phone.translate(_PHONE_DELETE)
+    if not cleaned.startswith("+"):
+        # Assume Irish if starts with 0
+        if cleaned.startswith("0"):
+            cleaned = "+353" + cleaned[1:]
+        else:
+            cleaned = "+" + cleaned
+    analysis = _analyze(cleaned)
+    return (
+        cleaned,
+        analysis["country"],
+        analysis["carrier"],
+        analysis["number_type"],
+        _is_e164(cleaned),
+        analysis["irish_analysis"],
+    )
+
 
 class PhoneModule(BaseOSINTModule):
     """Analyze and enrich phone number data."""
@@ -57,20 +172,13 @@ class PhoneModule(BaseOSINTModule):
         logger.info(f"Analyzing phone number: {phone}")
         found_entities = []
 
-        # Normalize
-        cleaned = re.sub(r"[\s\-\(\)\.]", "", phone)
-        if not cleaned.startswith("+"):
-            # Assume Irish if starts with 0
-            if cleaned.startswith("0"):
-                cleaned = "+353" + cleaned[1:]
-            else:
-                cleaned = "+" + cleaned
+        cleaned, country, carrier, number_type, is_valid, irish = _pure_analyze(phone)
 
         entity.metadata["normalized"] = cleaned
         entity.metadata["original"] = phone
 
         # Detect country
-        country_info = self._detect_country(cleaned)
+        country_info = dict(country) if country else None
         entity.metadata["country"] = country_info
 
         if country_info:
@@ -91,7 +199,7 @@ class PhoneModule(BaseOSINTModule):
             found_entities.append(added)
 
         # Detect carrier (Irish numbers)
-        carrier_info = self._detect_irish_carrier(cleaned)
+        carrier_info = dict(carrier) if carrier else None
         if carrier_info:
             entity.metadata["carrier"] = carrier_info
             carrier_entity = Entity(
@@ -111,90 +219,15 @@ class PhoneModule(BaseOSINTModule):
             found_entities.append(added)
 
         # Classify number type
-        number_type = self._classify_number_type(cleaned)
         entity.metadata["number_type"] = number_type
 
         # Format validation
-        entity.metadata["is_valid_format"] = self._validate_format(cleaned)
+        entity.metadata["is_valid_format"] = is_valid
         entity.metadata["e164_format"] = cleaned
 
         # Irish-specific checks
-        if country_info and country_info.get("iso") == "IE":
-            entity.metadata["irish_analysis"] = self._analyze_irish_number(cleaned)
+        if irish:
+            entity.metadata["irish_analysis"] = dict(irish)
 
         logger.info(f"Phone analysis complete: {len(found_entities)} entities discovered")
         return found_entities
-
-    def _detect_country(self, phone: str) -> Optional[Dict]:
-        """Detect country from phone number prefix."""
-        digits = phone.lstrip("+")
-        # Try 3-digit codes first, then 2-digit, then 1-digit
-        for length in [3, 2, 1]:
-            prefix = digits[:length]
-            if prefix in COUNTRY_CODES:
-                return COUNTRY_CODES[prefix].copy()
-        return None
-
-    def _detect_irish_carrier(self, phone: str) -> Optional[Dict]:
-        """Detect Irish mobile carrier from phone prefix."""
-        # Convert +353 to 0-prefix format for carrier lookup
-        if phone.startswith("+353"):
-            local = "0" + phone[4:]
-            prefix = local[:3]
-            if prefix in IRISH_CARRIERS:
-                return {
-                    "carrier": IRISH_CARRIERS[prefix],
-                    "prefix": prefix,
-                    "type": "mobile",
-                    "country": "Ireland",
-                }
-        return None
-
-    def _classify_number_type(self, phone: str) -> str:
-        """Classify number as mobile, landline, VoIP, toll-free, etc."""
-        if phone.startswith("+353"):
-            local = phone[4:]
-            if local.startswith("1"):
-                return "landline (Dublin)"
-            if local.startswith(("21", "22", "23", "24", "25", "26", "27", "28", "29")):
-                return "landline (Munster)"
-            if local.startswith(("41", "42", "43", "44", "45", "46", "47", "49")):
-                return "landline (Leinster/Ulster)"
-            if local.startswith(("51", "52", "53", "54", "56", "57", "58", "59")):
-                return "landline (South-East)"
-            if local.startswith(("61", "62", "63", "64", "65", "66", "67", "68", "69")):
-                return "landline (Mid-West/Kerry)"
-            if local.startswith(("71", "74", "76", "90", "91", "93", "94", "95", "96", "97", "98", "99")):
-                return "landline (West/North-West)"
-            if local.startswith(("83", "85", "86", "87", "89")):
-                return "mobile"
-            if local.startswith("1800"):
-                return "toll-free"
-            if local.startswith("1850") or local.startswith("1890"):
-                return "shared-cost"
-        return "unknown"
-
-    def _validate_format(self, phone: str) -> bool:
-        """Validate E.164 format."""
-        return bool(re.match(r"^\+\d{7,15}$", phone))
-
-    def _analyze_irish_number(self, phone: str) -> Dict:
-        """Additional analysis for Irish phone numbers."""
-        local = phone[4:]  # Remove +353
-        analysis = {
-            "is_irish": True,
-            "local_number": "0" + local,
-            "international_format": phone,
-        }
-
-        # Check if it's a premium rate number
-        if local.startswith("15"):
-            analysis["warning"] = "Premium rate number"
-            analysis["risk_level"] = "high"
-
-        # Check for known VoIP ranges
-        if local.startswith("76"):
-            analysis["note"] = "VoIP number range — may be harder to trace"
-            analysis["is_voip"] = True
-
-        return analysis
@@ -1,12 +1,21 @@
 """Social Media OSINT Module — Profile discovery across platforms."""
+import hashlib
 import logging
+import functools
 from typing import List
 from eirescope.core.entity import Entity, EntityType, Investigation
 from eirescope.modules.base import BaseOSINTModule
-from eirescope.utils.http_client import OSINTHTTPClient
+from eirescope.utils.http_client import get_shared_client
 
 logger = logging.getLogger("eirescope.modules.social")
 
+# Gravatar hashes are identifiers, not security; usedforsecurity is 3.9+
+try:
+    hashlib.md5(b"", usedforsecurity=False)
+    _md5 = functools.partial(hashlib.md5, usedforsecurity=False)
+except TypeError:
+    _md5 = hashlib.md5
+
 # Social platforms that allow email-based search or public profile lookup
 SOCIAL_SEARCH_URLS = {
     "GitHub": "https://api.github.com/search/users?q={}",
@@ -25,7 +34,7 @@ class SocialMediaModule(BaseOSINTModule):
 
     def __init__(self, config=None):
         super().__init__(config)
-        self.http = OSINTHTTPClient(timeout=8, max_retries=2, rate_limit=0.3)
+        self.http = get_shared_client(timeout=8, max_retries=2, rate_limit=0.3)
 
     def execute(self, entity: Entity, investigation: Investigation) -> List[Entity]:
         """Discover social profiles from entity."""
@@ -48,7 +57,7 @@ class SocialMediaModule(BaseOSINTModule):
         try:
             resp = self.http.get(f"https://api.github.com/users/{username}")
             if resp and resp.status_code == 200:
-                data = resp.json()
+                data = self.http.json(resp)
                 profile_entity = Entity(
                     entity_type=EntityType.SOCIAL_PROFILE,
                     value=data.get("html_url", f"https://github.com/{username}"),
@@ -123,15 +132,36 @@ class SocialMediaModule(BaseOSINTModule):
         found = []
         email = entity.value
 
-        # Check Gravatar
-        import hashlib
-        email_hash = hashlib.md5(email.lower().encode()).hexdigest()
+        # Check Gravatar (hash of the trimmed, lowercased address)
+        email_hash = _md5(email.strip().lower().encode()).hexdigest()
         try:
             resp = self.http.get(f"https://en.gravatar.com/{email_hash}.json")
             if resp and resp.status_code == 200:
-                data = resp.json()
+                data = self.http.json(resp)
                 if "entry" in data and data["entry"]:
                     entry = data["entry"][0]
+
+                    # One walk over the linked accounts builds both the profile
+                    # metadata and the entities for distinct account URLs
+                    accounts_meta = []
+                    linked = []
+                    seen_urls = set()
+                    for account in entry.get("accounts", []):
+                        url = account.get("url")
+                        accounts_meta.append({"platform": account.get("shortname"), "url": url})
+                        if url and url not in seen_urls:
+                            seen_urls.add(url)
+                            linked.append(Entity(
+                                entity_type=EntityType.SOCIAL_PROFILE,
+                                value=url,
+                                source_module=self.name,
+                                confidence=0.85,
+                                metadata={
+                                    "platform": account.get("shortname", "unknown"),
+                                    "source": "gravatar_linked",
+                                },
+                            ))
+
                     profile_entity = Entity(
                         entity_type=EntityType.SOCIAL_PROFILE,
                         value=entry.get("profileUrl", f"https://gravatar.com/{email_hash}"),
@@ -142,10 +172,7 @@ class SocialMediaModule(BaseOSINTModule):
                             "display_name": entry.get("displayName"),
                             "about": entry.get("aboutMe"),
                             "location": entry.get("currentLocation"),
-                            "accounts": [
-                                {"platform": a.get("shortname"), "url": a.get("url")}
-                                for a in entry.get("accounts", [])
-                            ],
+                            "accounts": accounts_meta,
                         },
                     )
                     added = investigation.add_entity(profile_entity)
@@ -157,27 +184,13 @@ class SocialMediaModule(BaseOSINTModule):
                     )
                     found.append(added)
 
-                    # Extract linked accounts from Gravatar
-                    for account in entry.get("accounts", []):
-                        if account.get("url"):
-                            acc_entity = Entity(
-                                entity_type=EntityType.SOCIAL_PROFILE,
-                                value=account["url"],
-                                source_module=self.name,
-                                confidence=0.85,
-                                metadata={
-                                    "platform": account.get("shortname", "unknown"),
-                                    "source": "gravatar_linked",
-                                },
-                            )
-                            added_acc = investigation.add_entity(acc_entity)
-                            investigation.add_relationship(
-                                source_id=added.id,
-                                target_id=added_acc.id,
-                                rel_type="gravatar_links_to",
-                                confidence=0.85,
-                            )
-                            found.append(added_acc)
+                    # Linked accounts from Gravatar
+                    added_accounts = investigation.add_entities(linked)
+                    investigation.add_relationships([
+                        (added.id, added_acc.id, "gravatar_links_to", 0.85)
+                        for added_acc in added_accounts
+                    ])
+                    found.extend(added_accounts)
         except Exception as e:
             logger.debug(f"Gravatar search failed: {e}")
 
@@ -1,31 +1,42 @@
 """Username OSINT Module — Search username across social platforms (Sherlock-like)."""
 import logging
-from typing import List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from typing import FrozenSet, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
 from eirescope.core.entity import Entity, EntityType, Investigation
 from eirescope.modules.base import BaseOSINTModule
-from eirescope.utils.http_client import OSINTHTTPClient
+from eirescope.utils import dns_cache
+from eirescope.utils.cache import TTLCache
+from eirescope.utils.http_client import get_shared_client
 
 logger = logging.getLogger("eirescope.modules.username")
 
-# Platforms to check: name, URL template ({} = username), error indicator
+# Platforms to check: name, URL template ({} = username), category, and for
+# sites that answer 200 for missing users, the page text that marks absence.
+# Redirects are not followed: only a status in "exists_codes" (default 200)
+# counts as a hit, so a bounce to a login or not-found page costs one request.
+# URLs therefore point at each site's canonical host and path; sites that
+# redirect every profile (name -> numeric id) list their 3xx in exists_codes.
 PLATFORMS = [
     # ═══════════════════════════════════════════
     # Major Social Media
     # ═══════════════════════════════════════════
     {"name": "Twitter/X", "url": "https://x.com/{}", "category": "social"},
-    {"name": "Instagram", "url": "https://www.instagram.com/{}/", "category": "social"},
+    {"name": "Instagram", "url": "https://www.instagram.com/{}/", "category": "social",
+     "not_found_text": "Sorry, this page isn't available"},
     {"name": "Facebook", "url": "https://www.facebook.com/{}", "category": "social"},
-    {"name": "Reddit", "url": "https://www.reddit.com/user/{}", "category": "social"},
+    {"name": "Reddit", "url": "https://www.reddit.com/user/{}", "category": "social",
+     "not_found_text": "Sorry, nobody on Reddit goes by that name"},
     {"name": "TikTok", "url": "https://www.tiktok.com/@{}", "category": "social"},
     {"name": "YouTube", "url": "https://www.youtube.com/@{}", "category": "social"},
     {"name": "Twitch", "url": "https://www.twitch.tv/{}", "category": "social"},
     {"name": "Pinterest", "url": "https://www.pinterest.com/{}/", "category": "social"},
-    {"name": "Tumblr", "url": "https://{}.tumblr.com", "category": "social"},
+    {"name": "Tumblr", "url": "https://www.tumblr.com/{}", "category": "social"},
     {"name": "Snapchat", "url": "https://www.snapchat.com/add/{}", "category": "social"},
     {"name": "VK", "url": "https://vk.com/{}", "category": "social"},
     {"name": "OK.ru", "url": "https://ok.ru/profile/{}", "category": "social"},
-    {"name": "Threads", "url": "https://www.threads.net/@{}", "category": "social"},
+    {"name": "Threads", "url": "https://www.threads.com/@{}", "category": "social"},
     {"name": "Bluesky", "url": "https://bsky.app/profile/{}.bsky.social", "category": "social"},
     # ═══════════════════════════════════════════
     # Mastodon / Fediverse
@@ -49,7 +60,7 @@ PLATFORMS = [
     {"name": "Fiverr", "url": "https://www.fiverr.com/{}", "category": "professional"},
     {"name": "Freelancer", "url": "https://www.freelancer.com/u/{}", "category": "professional"},
     {"name": "Upwork", "url": "https://www.upwork.com/freelancers/~{}", "category": "professional"},
-    {"name": "AngelList", "url": "https://angel.co/u/{}", "category": "professional"},
+    {"name": "AngelList", "url": "https://wellfound.com/u/{}", "category": "professional"},
     {"name": "Crunchbase", "url": "https://www.crunchbase.com/person/{}", "category": "professional"},
     {"name": "Glassdoor", "url": "https://www.glassdoor.com/member/{}", "category": "professional"},
     # ═══════════════════════════════════════════
@@ -59,7 +70,8 @@ PLATFORMS = [
     {"name": "GitLab", "url": "https://gitlab.com/{}", "category": "development"},
     {"name": "Bitbucket", "url": "https://bitbucket.org/{}/", "category": "development"},
     {"name": "Dev.to", "url": "https://dev.to/{}", "category": "development"},
-    {"name": "HackerNews", "url": "https://news.ycombinator.com/user?id={}", "category": "development"},
+    {"name": "HackerNews", "url": "https://news.ycombinator.com/user?id={}", "category": "development",
+     "not_found_text": "No such user."},
     {"name": "StackOverflow", "url": "https://stackoverflow.com/users/?tab=accounts&SearchText={}", "category": "development"},
     {"name": "Replit", "url": "https://replit.com/@{}", "category": "development"},
     {"name": "CodePen", "url": "https://codepen.io/{}", "category": "development"},
@@ -72,20 +84,20 @@ PLATFORMS = [
     {"name": "Packagist", "url": "https://packagist.org/users/{}/", "category": "development"},
     {"name": "Docker Hub", "url": "https://hub.docker.com/u/{}", "category": "development"},
     {"name": "Codewars", "url": "https://www.codewars.com/users/{}", "category": "development"},
-    {"name": "HackerRank", "url": "https://www.hackerrank.com/{}", "category": "development"},
-    {"name": "LeetCode", "url": "https://leetcode.com/{}/", "category": "development"},
+    {"name": "HackerRank", "url": "https://www.hackerrank.com/profile/{}", "category": "development"},
+    {"name": "LeetCode", "url": "https://leetcode.com/u/{}/", "category": "development"},
     {"name": "Codecademy", "url": "https://www.codecademy.com/profiles/{}", "category": "development"},
     {"name": "Kaggle", "url": "https://www.kaggle.com/{}", "category": "development"},
     {"name": "Hashnode", "url": "https://hashnode.com/@{}", "category": "development"},
     {"name": "SourceForge", "url": "https://sourceforge.net/u/{}/", "category": "development"},
     {"name": "Launchpad", "url": "https://launchpad.net/~{}", "category": "development"},
-    {"name": "OpenHub", "url": "https://openhub.net/accounts/{}", "category": "development"},
+    {"name": "OpenHub", "url": "https://www.openhub.net/accounts/{}", "category": "development"},
     # ═══════════════════════════════════════════
     # Security / Infosec
     # ═══════════════════════════════════════════
     {"name": "Keybase", "url": "https://keybase.io/{}", "category": "security"},
     {"name": "HackerOne", "url": "https://hackerone.com/{}", "category": "security"},
-    {"name": "Bugcrowd", "url": "https://bugcrowd.com/{}", "category": "security"},
+    {"name": "Bugcrowd", "url": "https://bugcrowd.com/h/{}", "category": "security"},
     {"name": "TryHackMe", "url": "https://tryhackme.com/p/{}", "category": "security"},
     {"name": "Hack The Box", "url": "https://app.hackthebox.com/users/{}", "category": "security"},
     {"name": "CyberDefenders", "url": "https://cyberdefenders.org/p/{}", "category": "security"},
@@ -119,16 +131,19 @@ PLATFORMS = [
     # ═══════════════════════════════════════════
     # Gaming
     # ═══════════════════════════════════════════
-    {"name": "Steam Community", "url": "https://steamcommunity.com/id/{}", "category": "gaming"},
+    {"name": "Steam Community", "url": "https://steamcommunity.com/id/{}", "category": "gaming",
+     "not_found_text": "The specified profile could not be found"},
     {"name": "Xbox Gamertag", "url": "https://xboxgamertag.com/search/{}", "category": "gaming"},
-    {"name": "Roblox", "url": "https://www.roblox.com/user.aspx?username={}", "category": "gaming"},
+    {"name": "Roblox", "url": "https://www.roblox.com/user.aspx?username={}", "category": "gaming",
+     "not_found_text": "Page cannot be found or no longer exists"},
     {"name": "Epic Games", "url": "https://store.epicgames.com/u/{}", "category": "gaming"},
     {"name": "Minecraft", "url": "https://namemc.com/profile/{}", "category": "gaming"},
     {"name": "Chess.com", "url": "https://www.chess.com/member/{}", "category": "gaming"},
     {"name": "Lichess", "url": "https://lichess.org/@/{}", "category": "gaming"},
-    {"name": "Speedrun.com", "url": "https://www.speedrun.com/user/{}", "category": "gaming"},
+    {"name": "Speedrun.com", "url": "https://www.speedrun.com/users/{}", "category": "gaming"},
     {"name": "Fortnite Tracker", "url": "https://fortnitetracker.com/profile/all/{}", "category": "gaming"},
-    {"name": "osu!", "url": "https://osu.ppy.sh/users/{}", "category": "gaming"},
+    {"name": "osu!", "url": "https://osu.ppy.sh/users/{}", "category": "gaming",
+     "exists_codes": (200, 302)},  # names redirect to the numeric profile
     # ═══════════════════════════════════════════
     # News / Blogging / Writing
     # ═══════════════════════════════════════════
@@ -148,12 +163,11 @@ PLATFORMS = [
     # ═══════════════════════════════════════════
     # Forums / Communities
     # ═══════════════════════════════════════════
-    {"name": "Gravatar", "url": "https://en.gravatar.com/{}", "category": "other"},
+    {"name": "Gravatar", "url": "https://gravatar.com/{}", "category": "other"},
     {"name": "Disqus", "url": "https://disqus.com/by/{}/", "category": "forums"},
     {"name": "ProductHunt", "url": "https://www.producthunt.com/@{}", "category": "forums"},
-    {"name": "Hacker News (YC)", "url": "https://news.ycombinator.com/user?id={}", "category": "forums"},
     {"name": "Indie Hackers", "url": "https://www.indiehackers.com/{}", "category": "forums"},
-    {"name": "Lobsters", "url": "https://lobste.rs/u/{}", "category": "forums"},
+    {"name": "Lobsters", "url": "https://lobste.rs/~{}", "category": "forums"},
     {"name": "SlashDot", "url": "https://slashdot.org/~{}", "category": "forums"},
     {"name": "Discourse (Meta)", "url": "https://meta.discourse.org/u/{}", "category": "forums"},
     # ═══════════════════════════════════════════
@@ -183,7 +197,8 @@ PLATFORMS = [
     {"name": "Coursera", "url": "https://www.coursera.org/user/{}", "category": "education"},
     {"name": "Khan Academy", "url": "https://www.khanacademy.org/profile/{}", "category": "education"},
     {"name": "Duolingo", "url": "https://www.duolingo.com/profile/{}", "category": "education"},
-    {"name": "Goodreads", "url": "https://www.goodreads.com/{}", "category": "education"},
+    {"name": "Goodreads", "url": "https://www.goodreads.com/{}", "category": "education",
+     "exists_codes": (200, 301, 302)},  # vanity names redirect to /user/show/<id>
     # ═══════════════════════════════════════════
     # Wish Lists / Registries
     # ═══════════════════════════════════════════
@@ -192,7 +207,7 @@ PLATFORMS = [
     {"name": "Patreon", "url": "https://www.patreon.com/{}", "category": "other"},
     {"name": "Ko-fi", "url": "https://ko-fi.com/{}", "category": "other"},
     {"name": "BuyMeACoffee", "url": "https://www.buymeacoffee.com/{}", "category": "other"},
-    {"name": "Gumroad", "url": "https://gumroad.com/{}", "category": "other"},
+    {"name": "Gumroad", "url": "https://{}.gumroad.com", "category": "other"},
     {"name": "Linktree", "url": "https://linktr.ee/{}", "category": "other"},
     # ═══════════════════════════════════════════
     # Photo / Video Sharing
@@ -209,8 +224,6 @@ PLATFORMS = [
     # ═══════════════════════════════════════════
     # Misc / Other
     # ═══════════════════════════════════════════
-    {"name": "Gravatar", "url": "https://en.gravatar.com/{}", "category": "other"},
-    {"name": "Keybase", "url": "https://keybase.io/{}", "category": "other"},
     {"name": "Archive.org", "url": "https://archive.org/details/@{}", "category": "other"},
     {"name": "Wikipedia User", "url": "https://en.wikipedia.org/wiki/User:{}", "category": "other"},
     {"name": "Instructables", "url": "https://www.instructables.com/member/{}/", "category": "other"},
@@ -219,9 +232,9 @@ PLATFORMS = [
     {"name": "Letterboxd", "url": "https://letterboxd.com/{}/", "category": "other"},
     {"name": "MyAnimeList", "url": "https://myanimelist.net/profile/{}", "category": "other"},
     {"name": "AniList", "url": "https://anilist.co/user/{}", "category": "other"},
-    {"name": "Spotify Podcasters", "url": "https://podcasters.spotify.com/pod/show/{}", "category": "media"},
+    {"name": "Spotify Podcasters", "url": "https://creators.spotify.com/pod/show/{}", "category": "media"},
     {"name": "Carrd", "url": "https://{}.carrd.co", "category": "other"},
-    {"name": "Notion", "url": "https://notion.so/{}", "category": "other"},
+    {"name": "Notion", "url": "https://www.notion.so/{}", "category": "other"},
     # ═══════════════════════════════════════════
     # Irish / EU specific
     # ═══════════════════════════════════════════
@@ -230,6 +243,68 @@ PLATFORMS = [
     {"name": "DoneDeal", "url": "https://www.donedeal.ie/seller/{}", "category": "irish"},
 ]
 
+# Hosts that answer HEAD differently from GET (error or login page); checked
+# with a ranged GET straight away
+HEAD_HOSTILE_HOSTS = frozenset({"www.instagram.com", "www.tiktok.com"})
+
+
+class Platform(NamedTuple):
+    """A platform ready to check: its URL template pre-split around "{}"."""
+    name: str
+    pre: str
+    post: str
+    host: str
+    category: str
+    not_found_text: Optional[bytes]
+    head: bool
+    exists_codes: FrozenSet[int]
+
+
+def _platform(entry: dict) -> Platform:
+    pre, post = entry["url"].split("{}")
+    host = urlsplit(entry["url"].format("x")).hostname
+    marker = entry.get("not_found_text")
+    return Platform(
+        name=entry["name"],
+        pre=pre,
+        post=post,
+        host=host,
+        category=entry["category"],
+        not_found_text=marker.encode() if marker else None,
+        head=host not in HEAD_HOSTILE_HOSTS,
+        exists_codes=frozenset(entry.get("exists_codes", (200,))),
+    )
+
+
+# What execute() checks: one entry per distinct URL (first listing wins),
+# in platform-name order so results need no sorting afterwards
+_CHECK_ORDER = tuple(sorted(
+    (_platform(p) for p in {p["url"]: p for p in reversed(PLATFORMS)}.values()),
+    key=lambda p: p.name,
+))
+
+_dns_prewarm_lock = threading.Lock()
+_dns_prewarmed = False
+
+
+def _prewarm_platform_dns():
+    """Resolve every platform host into dns_cache so the first search's
+    connections skip their getaddrinfo() round trips."""
+    for platform in _CHECK_ORDER:
+        port = 443 if platform.pre.startswith("https:") else 80
+        try:
+            dns_cache.addresses(platform.host, port)
+        except (OSError, UnicodeError) as e:
+            logger.debug(f"DNS prewarm failed for {platform.host}: {e}")
+
+
+# Probe outcomes per profile URL, so a repeated search (a UI refresh, the
+# same username across investigations) answers without network calls
+_probe_cache = TTLCache(maxsize=10000, ttl=5 * 60)
+
+# How much of a page is scanned for a platform's not-found text
+NOT_FOUND_SCAN_BYTES = 128 * 1024
+
 
 class UsernameModule(BaseOSINTModule):
     """Search for a username across multiple social platforms."""
@@ -242,80 +317,98 @@ class UsernameModule(BaseOSINTModule):
 
     def __init__(self, config=None):
         super().__init__(config)
-        self.http = OSINTHTTPClient(
+        # Checks are pure network waits on distinct hosts (rate limiting is per
+        # host): run up to one per platform, with a keep-alive pool to match
+        self.max_workers = min(len(_CHECK_ORDER), self.config.get("USERNAME_MAX_WORKERS", 64))
+        # Shared across instances and searches: platform hosts repeat every
+        # run, so their connections and TLS sessions are kept alive
+        self.http = get_shared_client(
             timeout=config.get("timeout", 8) if config else 8,
             max_retries=1,
             rate_limit=0.1,
+            pool_size=max(32, self.max_workers),
         )
-        self.max_workers = 10
+        self._probe_ttl = self.config.get("USERNAME_CACHE_TTL", _probe_cache.ttl)
+        global _dns_prewarmed
+        with _dns_prewarm_lock:
+            if not _dns_prewarmed:
+                _dns_prewarmed = True
+                threading.Thread(target=_prewarm_platform_dns, name="username-dns-prewarm",
+                                 daemon=True).start()
 
-    def _check_platform(self, platform: dict, username: str) -> dict:
-        """Check if username exists on a single platform."""
-        url = platform["url"].format(username)
+    def _check_platform(self, platform: Platform, username: str) -> dict:
+        """Check if username exists on a single platform.
+
+        Returns the platform's results_summary entry: platform, url, found.
+        """
+        url = platform.pre + username + platform.post
+        found = _probe_cache.get(url)
+        if found is not None:
+            return {"platform": platform.name, "url": url, "found": found}
         try:
-            exists = self.http.check_url_exists(url, timeout=6)
-            return {
-                "platform": platform["name"],
-                "url": url,
-                "exists": exists,
-                "category": platform["category"],
-            }
+            marker = platform.not_found_text
+            if marker:
+                # Status alone is not enough here: read the page until the marker shows up
+                page = self.http.read_prefix(url, timeout=6, max_bytes=NOT_FOUND_SCAN_BYTES, until=marker)
+                found = None if page is None else page[0] == 200 and marker not in page[1]
+            else:
+                found = self.http.check_url_exists(
+                    url, timeout=6, head=platform.head,
+                    allow_redirects=False, exists_codes=platform.exists_codes,
+                )
         except Exception as e:
-            logger.debug(f"Error checking {platform['name']}: {e}")
-            return {
-                "platform": platform["name"],
-                "url": url,
-                "exists": False,
-                "category": platform["category"],
-                "error": str(e),
-            }
+            logger.debug(f"Error checking {platform.name}: {e}")
+            found = None
+        # Only definite answers are cached; a failed probe is retried next search
+        if found is None:
+            found = False
+        else:
+            _probe_cache.set(url, found, self._probe_ttl)
+        return {"platform": platform.name, "url": url, "found": found}
+
+    @staticmethod
+    def clear_cache():
+        """Forget cached probe outcomes, so the next search re-checks every platform."""
+        _probe_cache.clear()
 
     def execute(self, entity: Entity, investigation: Investigation) -> List[Entity]:
         """Search username across all platforms using thread pool."""
         username = entity.value
-        logger.info(f"Searching username '{username}' across {len(PLATFORMS)} platforms")
-
-        found_entities = []
-        results = []
+        logger.info(f"Searching username '{username}' across {len(_CHECK_ORDER)} platforms")
 
+        # map() keeps _CHECK_ORDER, so results come back sorted by platform
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(self._check_platform, p, username): p
-                for p in PLATFORMS
-            }
-            for future in as_completed(futures):
-                result = future.result()
-                results.append(result)
-                if result["exists"]:
-                    profile_entity = Entity(
-                        entity_type=EntityType.SOCIAL_PROFILE,
-                        value=result["url"],
-                        source_module=self.name,
-                        confidence=0.85,
-                        metadata={
-                            "platform": result["platform"],
-                            "category": result["category"],
-                            "username": username,
-                        },
-                    )
-                    added = investigation.add_entity(profile_entity)
-                    investigation.add_relationship(
-                        source_id=entity.id,
-                        target_id=added.id,
-                        rel_type="has_profile_on",
-                        confidence=0.85,
-                        evidence={"url": result["url"], "platform": result["platform"]},
-                    )
-                    found_entities.append(added)
-                    logger.info(f"  [+] Found: {result['platform']} → {result['url']}")
+            results = list(executor.map(lambda p: self._check_platform(p, username), _CHECK_ORDER))
+
+        hits = [(platform, result) for platform, result in zip(_CHECK_ORDER, results) if result["found"]]
+        # One lock acquisition for all profiles, then all their relationships
+        found_entities = investigation.add_entities([
+            Entity(
+                entity_type=EntityType.SOCIAL_PROFILE,
+                value=result["url"],
+                source_module=self.name,
+                confidence=0.85,
+                metadata={
+                    "platform": platform.name,
+                    "category": platform.category,
+                    "username": username,
+                },
+            )
+            for platform, result in hits
+        ])
+        investigation.add_relationships([
+            (entity.id, added.id, "has_profile_on", 0.85,
+             {"url": result["url"], "platform": result["platform"]})
+            for (_, result), added in zip(hits, found_entities)
+        ])
+        for _, result in hits:
+            logger.info(f"  [+] Found: {result['platform']} → {result['url']}")
 
-        # Store summary in the original entity metadata
-        entity.metadata["platforms_checked"] = len(PLATFORMS)
+        # Store summary in the original entity metadata; the per-platform
+        # results already have the summary's shape
+        entity.metadata["platforms_checked"] = len(_CHECK_ORDER)
         entity.metadata["profiles_found"] = len(found_entities)
-        entity.metadata["results_summary"] = [
-            {"platform": r["platform"], "url": r["url"], "found": r["exists"]}
-            for r in sorted(results, key=lambda x: x["platform"])
-        ]
+        entity.metadata["results_summary"] = results
 
-        logger.info(f"Username search complete: {len(found_entities)}/{len(PLATFORMS)} platforms found")
+        logger.info(f"Username search complete: {len(found_entities)}/{len(_CHECK_ORDER)} platforms found")
         return found_entities
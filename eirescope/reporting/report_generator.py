@@ -1,7 +1,8 @@
 """Report generator — Creates exportable HTML investigation reports."""
 import os
-import json
 import logging
+from functools import cached_property
+from typing import Dict
 from jinja2 import Environment, FileSystemLoader
 from eirescope.core.entity import Investigation
 from eirescope.core.results import summarize_investigation
@@ -24,19 +25,27 @@ class ReportGenerator:
         self.env = Environment(
             loader=FileSystemLoader(dirs),
             autoescape=True,
+            auto_reload=False,
         )
 
+    @cached_property
+    def template(self):
+        """The compiled report template, looked up once per generator."""
+        return self.env.get_template("report.html")
+
     def generate_html(self, investigation: Investigation) -> str:
         """Generate a standalone HTML report."""
-        summary = summarize_investigation(investigation)
-        template = self.env.get_template("report.html")
-        return template.render(inv=summary, json_data=json.dumps(summary))
+        return self.render_summary(summarize_investigation(investigation))
+
+    def render_summary(self, summary: Dict) -> str:
+        """Render a report from an already built investigation summary."""
+        return self.template.render(inv=summary)
 
     def save_html(self, investigation: Investigation, output_path: str) -> str:
-        """Generate and save HTML report to file."""
-        html = self.generate_html(investigation)
+        """Generate and save HTML report to file, streaming the render to disk."""
+        summary = summarize_investigation(investigation)
         os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html)
+        with open(output_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            self.template.stream(inv=summary).dump(f)
         logger.info(f"Report saved to {output_path}")
         return output_path
@@ -0,0 +1,50 @@
+"""Process-wide DNS answer cache keyed by (name, record type).
+
+Entities in one investigation often share zones (an email's domain, its MX
+hosts, subdomains of the seed), so answers are kept for the record's TTL and
+reused by every module instead of being re-queried.
+"""
+import socket
+from typing import List, Optional
+from eirescope.utils.cache import TTLCache
+
+DEFAULT_TTL = 900  # used when the answer carries no TTL
+NEGATIVE_TTL = 60  # NXDOMAIN / empty answers
+ADDRESS_TTL = 300  # getaddrinfo() results, which carry no TTL
+
+_cache = TTLCache(maxsize=4096, ttl=DEFAULT_TTL)
+
+
+def _key(name: str, record_type: str):
+    return name.lower().rstrip("."), record_type.upper()
+
+
+def get(name: str, record_type: str) -> Optional[List[str]]:
+    """Return cached records, or None on a miss."""
+    records = _cache.get(_key(name, record_type))
+    return None if records is None else list(records)
+
+
+def put(name: str, record_type: str, records: List[str], ttl: Optional[float] = None):
+    """Cache records for `ttl` seconds (negative TTL for empty answers)."""
+    if ttl is None:
+        ttl = DEFAULT_TTL if records else NEGATIVE_TTL
+    _cache.set(_key(name, record_type), list(records), ttl)
+
+
+def addresses(host: str, port: int) -> List[str]:
+    """IP addresses to connect to for host:port, in getaddrinfo() order.
+
+    Cached for ADDRESS_TTL; resolution errors propagate and are not cached.
+    """
+    key = (host.lower().rstrip("."), port, "TCP")
+    ips = _cache.get(key)
+    if ips is None:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        ips = list(dict.fromkeys(info[4][0] for info in infos))
+        _cache.set(key, ips, ADDRESS_TTL)
+    return list(ips)
+
+
+def clear():
+    _cache.clear()
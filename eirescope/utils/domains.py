@@ -0,0 +1,56 @@
+"""Registrable-domain extraction — uses tldextract's bundled Public Suffix List
+when it is installed, otherwise a built-in table of common multi-label suffixes."""
+import functools
+from typing import Optional
+
+try:
+    import tldextract
+except ImportError:
+    tldextract = None
+
+# Offline extractor: bundled PSL snapshot, never fetches or writes a cache
+_extract = tldextract.TLDExtract(cache_dir=None, suffix_list_urls=()) if tldextract else None
+
+# Public suffixes with more than one label that commonly show up in reverse
+# DNS; anything not listed is treated as a single-label TLD.
+MULTI_LABEL_SUFFIXES = frozenset({
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk", "net.uk", "me.uk", "sch.uk",
+    "gov.ie",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au", "asn.au", "id.au",
+    "co.nz", "net.nz", "org.nz", "govt.nz", "ac.nz",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp", "ad.jp",
+    "co.kr", "or.kr", "ne.kr",
+    "com.br", "net.br", "org.br", "gov.br",
+    "com.cn", "net.cn", "org.cn", "gov.cn", "edu.cn",
+    "com.hk", "net.hk", "org.hk",
+    "com.tw", "net.tw", "org.tw",
+    "com.sg", "net.sg", "org.sg",
+    "com.my", "net.my",
+    "co.in", "net.in", "org.in", "gov.in", "ac.in",
+    "co.za", "org.za", "net.za", "gov.za",
+    "com.mx", "net.mx", "org.mx",
+    "com.ar", "net.ar", "com.co", "net.co", "com.pe",
+    "com.tr", "net.tr", "org.tr",
+    "co.il", "net.il", "org.il", "ac.il",
+    "com.ua", "net.ua", "in.ua", "com.pl", "net.pl",
+    "co.id", "net.id", "or.id", "co.th", "in.th", "com.vn", "com.ph",
+    "com.eg", "com.sa", "com.pk", "com.ng", "co.ke",
+})
+
+
+@functools.lru_cache(maxsize=4096)
+def registrable_domain(hostname: str) -> Optional[str]:
+    """Registrable domain (public suffix plus one label) of a hostname, or None."""
+    hostname = hostname.rstrip(".").lower()
+    if _extract is not None:
+        ext = _extract(hostname)
+        if ext.domain and ext.suffix:
+            return f"{ext.domain}.{ext.suffix}"
+        return None
+    parts = hostname.split(".")
+    if len(parts) < 2:
+        return None
+    labels = 3 if ".".join(parts[-2:]) in MULTI_LABEL_SUFFIXES else 2
+    if len(parts) < labels:
+        return None
+    return ".".join(parts[-labels:])
@@ -3,29 +3,29 @@
 
 class EireScopeError(Exception):
     """Base exception for EireScope."""
-    pass
+    __slots__ = ()
 
 
 class ValidationError(EireScopeError):
     """Invalid input data."""
-    pass
+    __slots__ = ()
 
 
 class ModuleError(EireScopeError):
     """Error in an OSINT module."""
-    pass
+    __slots__ = ()
 
 
 class ModuleNotFoundError(EireScopeError):
     """Requested module not found."""
-    pass
+    __slots__ = ()
 
 
 class RateLimitError(EireScopeError):
     """Rate limited by external service."""
-    pass
+    __slots__ = ()
 
 
 class APIKeyRequiredError(EireScopeError):
     """Module requires an API key that is not configured."""
-    pass
+    __slots__ = ()
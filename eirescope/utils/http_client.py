@@ -1,9 +1,28 @@
 """HTTP client with retries, rate limiting, and user-agent rotation for OSINT."""
+import os
+import re
 import time
+import zlib
 import random
+import itertools
+import sqlite3
 import logging
+import threading
+import socket
+import urllib3
+import urllib.request
 import requests
-from typing import Optional, Dict, Any
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, RequestException, Timeout
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from typing import Optional, Dict, Any, FrozenSet, Tuple
+from eirescope.utils import dns_cache, serialization
+from eirescope.utils.cache import TTLCache
 
 logger = logging.getLogger("eirescope.http")
 
@@ -15,38 +34,267 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0",
 ]
 
+# Pre-built per-agent header dicts, handed out in turn; never mutated
+_USER_AGENT_HEADERS = tuple({"User-Agent": ua} for ua in USER_AGENTS)
+_user_agent_turn = itertools.count()
+
+# Sent with every request (set once on the session); User-Agent is per request
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+    "DNT": "1",
+    "Connection": "keep-alive",
+}
+
+# Circuit breaker: consecutive timeouts/connection errors before a host is
+# skipped, and for how long (seconds)
+BROKEN_HOST_FAILURES = 2
+BROKEN_HOST_COOLDOWN = 600
+
+# Redirects an existence probe follows when asked to
+MAX_REDIRECTS = 10
+
+# Per-host connection pools a client keeps (least recently used are dropped)
+HOST_POOLS = 256
+
+# Default per-host lifetimes (seconds) for the on-disk response cache
+CACHE_EXPIRE_AFTER = {
+    "haveibeenpwned.com": 21600,
+    "emailrep.io": 86400,
+}
+
+_MAX_AGE_RX = re.compile(r"max-age=(\d+)")
+
+
+class ResponseCache:
+    """SQLite-backed cache of successful GET responses for slow, idempotent APIs.
+
+    Only hosts listed in ``expire_after`` (or their subdomains) are cached.
+    Bodies are stored zlib-compressed; servers' Cache-Control ``no-store`` and
+    ``max-age`` are honored.
+    """
+
+    def __init__(self, path: str, expire_after: Dict[str, int] = None):
+        self.expire_after = dict(expire_after or CACHE_EXPIRE_AFTER)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                   url TEXT PRIMARY KEY,
+                   status INTEGER NOT NULL,
+                   headers TEXT NOT NULL,
+                   body BLOB NOT NULL,
+                   expires_at REAL NOT NULL
+               )"""
+        )
+        self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+
+    def ttl_for(self, url: str) -> Optional[int]:
+        host = (urlsplit(url).hostname or "").lower()
+        for domain, ttl in self.expire_after.items():
+            if host == domain or host.endswith("." + domain):
+                return ttl
+        return None
+
+    def get(self, url: str) -> Optional[requests.Response]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body FROM responses WHERE url = ? AND expires_at > ?",
+                (url, time.time()),
+            ).fetchone()
+        if not row:
+            return None
+        resp = requests.Response()
+        resp.status_code = row[0]
+        resp.headers = CaseInsensitiveDict(serialization.loads(row[1]))
+        resp._content = zlib.decompress(row[2])
+        resp._content_consumed = True
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp.url = url
+        return resp
+
+    def put(self, url: str, resp: requests.Response, ttl: int):
+        cache_control = resp.headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return
+        m = _MAX_AGE_RX.search(cache_control)
+        if m:
+            ttl = min(ttl, int(m.group(1)))
+        if ttl <= 0:
+            return
+        headers = {k: v for k, v in resp.headers.items()
+                   if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        row = (url, resp.status_code, serialization.dumps(headers),
+               zlib.compress(resp.content), time.time() + ttl)
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO responses (url, status, headers, body, expires_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                row,
+            )
+            self._conn.commit()
+
+
+_response_caches: Dict[str, ResponseCache] = {}
+_response_caches_lock = threading.Lock()
+
+
+def get_response_cache(cache_dir: str = None) -> Optional[ResponseCache]:
+    """Shared ResponseCache for an app-private directory (config CACHE_DIR).
+
+    Cached bodies include per-email breach lookups, so there is no shared
+    temp-dir fallback: without a directory, responses are not cached.
+    """
+    if not cache_dir:
+        return None
+    path = os.path.join(cache_dir, "eirescope_http_cache.sqlite")
+    with _response_caches_lock:
+        cache = _response_caches.get(path)
+        if cache is None:
+            try:
+                os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+                # Owner-only; SQLite gives the -wal/-shm files the same mode
+                os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+                cache = _response_caches[path] = ResponseCache(path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"HTTP response cache disabled ({path}): {e}")
+        return cache
+
+
+class _CachedDNSConnectionMixin:
+    """Connect through dns_cache.addresses(), trying each address in turn,
+    so new connections to a known host skip getaddrinfo(). TLS still
+    verifies and sends SNI for the original hostname."""
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            ips = dns_cache.addresses(host, self.port)
+        except (socket.gaierror, UnicodeError):
+            return super()._new_conn()  # raises urllib3's own resolution error
+        error = None
+        for ip in ips:
+            self._dns_host = ip
+            try:
+                return super()._new_conn()
+            except (NewConnectionError, ConnectTimeoutError) as e:
+                error = e
+            finally:
+                self._dns_host = host
+        raise error
+
+
+class _CachedDNSHTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+_CACHED_DNS_POOL_CLASSES = {
+    "http": _CachedDNSHTTPConnectionPool,
+    "https": _CachedDNSHTTPSConnectionPool,
+}
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter whose direct connections resolve hosts via dns_cache."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(_CACHED_DNS_POOL_CLASSES)
+
 
 class OSINTHTTPClient:
     """HTTP client optimized for OSINT data collection."""
 
     def __init__(self, timeout: int = 10, max_retries: int = 3,
-                 rate_limit: float = 0.5, proxy: str = None):
+                 rate_limit: float = 0.5, proxy: str = None, pool_size: int = 32,
+                 cache: Optional[ResponseCache] = None):
         self.timeout = timeout
         self.max_retries = max_retries
         self.rate_limit = rate_limit
+        self.cache = cache
         self.session = requests.Session()
+        # Keep-alive pools large enough for the modules' concurrent fan-out, and
+        # enough per-host pools that a full username search evicts none of them
+        adapter = CachedDNSAdapter(pool_connections=max(pool_size, HOST_POOLS),
+                                   pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
         if proxy:
             self.session.proxies = {"http": proxy, "https": proxy}
-        self._last_request_time = 0
+        # Existence probes (check_url_exists / read_prefix) skip the requests
+        # layer and go straight to urllib3, with the same DNS cache and CA bundle
+        self._probe_kw = dict(num_pools=max(pool_size, HOST_POOLS), maxsize=pool_size,
+                              cert_reqs="CERT_REQUIRED", ca_certs=requests.certs.where())
+        self._probe_pool = self._new_probe_manager(proxy)
+        # Without an explicit proxy, probes honor HTTP(S)_PROXY / ALL_PROXY and
+        # NO_PROXY like the session does (trust_env); one manager per proxy URL
+        self._env_proxies = {} if proxy else urllib.request.getproxies()
+        self._env_proxy_pools: Dict[str, urllib3.PoolManager] = {}
+        self._env_proxy_lock = threading.Lock()
+        # Per-host time of the next allowed request: unrelated hosts never wait
+        # on each other, repeat hits on one host stay `rate_limit` apart
+        self._host_next: Dict[str, float] = {}
+        self._rate_lock = threading.Lock()
+        # Hosts seen rejecting HEAD; check_url_exists goes straight to GET for them
+        self._head_unsupported = set()
+        # Circuit breaker: hosts that failed BROKEN_HOST_FAILURES times in a row
+        # (timeouts / connection errors) are skipped for BROKEN_HOST_COOLDOWN
+        self._host_failures: Dict[str, int] = {}
+        self._broken_hosts = TTLCache(maxsize=1024, ttl=BROKEN_HOST_COOLDOWN)
 
     def _get_headers(self, extra_headers: Dict = None) -> Dict:
-        headers = {
-            "User-Agent": random.choice(USER_AGENTS),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "DNT": "1",
-            "Connection": "keep-alive",
-        }
-        if extra_headers:
-            headers.update(extra_headers)
-        return headers
-
-    def _rate_limit_wait(self):
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.rate_limit:
-            time.sleep(self.rate_limit - elapsed)
-        self._last_request_time = time.time()
+        # Static headers live on the session; only the user agent rotates,
+        # round-robin (count() is atomic, unlike random's shared state)
+        base = _USER_AGENT_HEADERS[next(_user_agent_turn) % len(_USER_AGENT_HEADERS)]
+        return {**base, **extra_headers} if extra_headers else base
+
+    def _host_broken(self, host: str) -> bool:
+        return self._broken_hosts.get(host, False)
+
+    def _record_failure(self, host: str):
+        with self._rate_lock:
+            failures = self._host_failures.get(host, 0) + 1
+            self._host_failures[host] = failures
+        if failures >= BROKEN_HOST_FAILURES:
+            if not self._host_broken(host):
+                logger.warning(f"Skipping {host} for {BROKEN_HOST_COOLDOWN}s after {failures} failures")
+            self._broken_hosts.set(host, True)
+
+    def _record_success(self, host: str):
+        if host in self._host_failures:
+            with self._rate_lock:
+                self._host_failures.pop(host, None)
+
+    def clear_broken_hosts(self):
+        """Forget all circuit-breaker state, so every host is tried again."""
+        with self._rate_lock:
+            self._host_failures.clear()
+        self._broken_hosts.clear()
+
+    def _rate_limit_wait(self, url: str):
+        host = urlsplit(url).hostname or ""
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._host_next.get(host, 0.0))
+            self._host_next[host] = slot + self.rate_limit
+        if slot > now:
+            time.sleep(slot - now)
 
     def get(self, url: str, headers: Dict = None, params: Dict = None,
             allow_redirects: bool = True, **kwargs) -> Optional[requests.Response]:
@@ -64,23 +312,43 @@ class OSINTHTTPClient:
                              json=json, **kwargs)
 
     def _request(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
+        # Streamed bodies are read (and maybe abandoned) by the caller; caching
+        # them here would download and buffer the whole body up front
+        cacheable = self.cache and method == "GET" and not kwargs.get("stream")
+        ttl = self.cache.ttl_for(url) if cacheable else None
+        if ttl:
+            cache_key = requests.Request(method, url, params=kwargs.get("params")).prepare().url
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            response = self._send(method, url, **kwargs)
+            if response is not None and response.status_code == 200:
+                try:
+                    self.cache.put(cache_key, response, ttl)
+                except Exception as e:
+                    logger.debug(f"Response cache write failed for {url}: {e}")
+            return response
+        return self._send(method, url, **kwargs)
+
+    def _send(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
         extra_headers = kwargs.pop("headers", None)
         kwargs["headers"] = self._get_headers(extra_headers)
         kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).hostname or ""
+        if self._host_broken(host):
+            logger.debug(f"Skipping {method} {url}: host circuit open")
+            return None
+
+        if self.max_retries == 1:
+            # Single-attempt clients (e.g. username probes) skip the retry loop
+            return self._attempt(method, url, host, 1, kwargs)[0]
 
         for attempt in range(self.max_retries):
-            try:
-                self._rate_limit_wait()
-                response = self.session.request(method, url, **kwargs)
+            response, retryable = self._attempt(method, url, host, attempt + 1, kwargs)
+            if not retryable:
                 return response
-            except requests.exceptions.Timeout:
-                logger.warning(f"Timeout on {method} {url} (attempt {attempt + 1})")
-            except requests.exceptions.ConnectionError:
-                logger.warning(f"Connection error on {method} {url} (attempt {attempt + 1})")
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request error on {method} {url}: {e}")
+            if self._host_broken(host):
                 return None
-
             if attempt < self.max_retries - 1:
                 backoff = (2 ** attempt) + random.uniform(0, 1)
                 time.sleep(backoff)
@@ -88,18 +356,150 @@ class OSINTHTTPClient:
         logger.error(f"All {self.max_retries} retries failed for {method} {url}")
         return None
 
-    def check_url_exists(self, url: str, timeout: int = 5) -> bool:
-        """Quick check if a URL returns a successful response."""
+    def _attempt(self, method: str, url: str, host: str, attempt: int,
+                 kwargs: Dict) -> Tuple[Optional[requests.Response], bool]:
+        """Send once; returns (response or None, whether a retry may help)."""
+        try:
+            self._rate_limit_wait(url)
+            response = self.session.request(method, url, **kwargs)
+            self._record_success(host)
+            return response, False
+        except Timeout:
+            logger.warning(f"Timeout on {method} {url} (attempt {attempt})")
+        except RequestsConnectionError:
+            logger.warning(f"Connection error on {method} {url} (attempt {attempt})")
+        except RequestException as e:
+            logger.error(f"Request error on {method} {url}: {e}")
+            return None, False
+        self._record_failure(host)
+        return None, True
+
+    @staticmethod
+    def json(response: requests.Response) -> Any:
+        """Decode a JSON response body (orjson when installed)."""
+        return serialization.loads(response.content)
+
+    def _new_probe_manager(self, proxy: str = None) -> urllib3.PoolManager:
+        manager = (urllib3.ProxyManager(proxy, **self._probe_kw) if proxy
+                   else urllib3.PoolManager(**self._probe_kw))
+        manager.pool_classes_by_scheme = dict(_CACHED_DNS_POOL_CLASSES)
+        return manager
+
+    def _probe_manager(self, url: str) -> urllib3.PoolManager:
+        """Pool manager for a probe: the environment's proxy unless NO_PROXY
+        excludes the host, else the client's own (direct or explicit proxy)."""
+        if not self._env_proxies:
+            return self._probe_pool
+        parts = urlsplit(url)
+        proxy = self._env_proxies.get(parts.scheme) or self._env_proxies.get("all")
+        if not proxy or urllib.request.proxy_bypass_environment(parts.hostname or "", self._env_proxies):
+            return self._probe_pool
+        with self._env_proxy_lock:
+            manager = self._env_proxy_pools.get(proxy)
+            if manager is None:
+                manager = self._env_proxy_pools[proxy] = self._new_probe_manager(proxy)
+        return manager
+
+    def _probe(self, method: str, url: str, timeout: float, allow_redirects: bool,
+               extra_headers: Dict = None) -> urllib3.HTTPResponse:
+        """One raw urllib3 request, no retries; the body is left unread."""
+        return self._probe_manager(url).request(
+            method,
+            url,
+            headers={**DEFAULT_HEADERS, **self._get_headers(extra_headers)},
+            timeout=timeout,
+            retries=urllib3.Retry(total=None, connect=0, read=0, status=0, other=0,
+                                  redirect=MAX_REDIRECTS if allow_redirects else 0,
+                                  raise_on_redirect=False),
+            redirect=allow_redirects,
+            preload_content=False,
+        )
+
+    def check_url_exists(self, url: str, timeout: int = 5, head: bool = True,
+                         allow_redirects: bool = True,
+                         exists_codes: FrozenSet[int] = frozenset({200})) -> Optional[bool]:
+        """Quick check if a URL answers with one of `exists_codes`.
+
+        Sends HEAD so no body is transferred; servers that reject HEAD
+        (403/405/501) are remembered per host and, like callers passing
+        ``head=False``, get a one-byte ranged GET instead (206 counts as 200).
+        With ``allow_redirects=False`` a 3xx is judged as-is, in one round trip.
+        None when no status was received (network error, host circuit open).
+        """
+        host = urlsplit(url).hostname or ""
+        if self._host_broken(host):
+            return None
         try:
-            self._rate_limit_wait()
-            resp = self.session.get(
-                url,
-                headers=self._get_headers(),
-                timeout=timeout,
-                allow_redirects=True,
-                stream=True,
+            self._rate_limit_wait(url)
+            if head and host not in self._head_unsupported:
+                resp = self._probe("HEAD", url, timeout, allow_redirects)
+                resp.drain_conn()  # no body, but http.client must see the response end
+                resp.release_conn()
+                if resp.status not in (403, 405, 501):
+                    self._record_success(host)
+                    return resp.status in exists_codes
+                self._head_unsupported.add(host)
+            resp = self._probe("GET", url, timeout, allow_redirects, {"Range": "bytes=0-0"})
+            if resp.status == 206:
+                resp.drain_conn()  # one byte; keeps the connection for reuse
+                resp.release_conn()
+            else:
+                resp.close()  # may be a full page: drop the connection instead
+            self._record_success(host)
+            status = 200 if resp.status == 206 else resp.status
+            return status in exists_codes
+        except Urllib3HTTPError:
+            self._record_failure(host)
+            return None
+        except Exception as e:
+            logger.debug(f"Existence probe failed for {url}: {e!r}")
+            return None
+
+    def read_prefix(self, url: str, timeout: int = 5, max_bytes: int = 65536,
+                    until: bytes = None) -> Optional[Tuple[int, bytes]]:
+        """GET a URL and return (status, first `max_bytes` of the decoded body).
+
+        Reading stops early once `until` appears in the body. None on errors.
+        """
+        host = urlsplit(url).hostname or ""
+        if self._host_broken(host):
+            return None
+        try:
+            self._rate_limit_wait(url)
+            resp = self._probe("GET", url, timeout, True)
+            body = bytearray()
+            try:
+                for chunk in resp.stream(16384, decode_content=True):
+                    body += chunk
+                    if len(body) >= max_bytes or (until and until in body[-(len(chunk) + len(until)):]):
+                        break
+            finally:
+                resp.close()
+            self._record_success(host)
+            return resp.status, bytes(body[:max_bytes])
+        except Urllib3HTTPError:
+            self._record_failure(host)
+            return None
+        except Exception as e:
+            logger.debug(f"Prefix read failed for {url}: {e!r}")
+            return None
+
+
+_shared_clients: Dict[tuple, OSINTHTTPClient] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_client(timeout: int = 10, max_retries: int = 3, rate_limit: float = 0.5,
+                      cache: Optional[ResponseCache] = None, pool_size: int = 32) -> OSINTHTTPClient:
+    """Process-wide client per settings, so modules and their instances share
+    keep-alive connection pools (and TLS sessions) instead of each opening
+    their own. requests.Session is safe to share across the worker threads."""
+    key = (timeout, max_retries, rate_limit, id(cache), pool_size)
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = _shared_clients[key] = OSINTHTTPClient(
+                timeout=timeout, max_retries=max_retries, rate_limit=rate_limit,
+                pool_size=pool_size, cache=cache,
             )
-            resp.close()
-            return resp.status_code == 200
-        except Exception:
-            return False
+        return client
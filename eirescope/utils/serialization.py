@@ -0,0 +1,124 @@
+"""JSON helpers — use orjson when it is installed, otherwise the stdlib json module."""
+import re
+import json
+import codecs
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def dumps_bytes(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize an object to compact UTF-8 JSON, ready to write to a socket.
+
+    `default` converts objects JSON has no type for, as in json.dumps.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def dumps_html(obj: Any) -> str:
+    """Serialize an object to JSON that is safe to inline in a <script> block.
+
+    "<", ">" and "&" are escaped so the data cannot close the script element
+    or open a comment, and U+2028/U+2029 so older JS engines can parse it.
+    """
+    return (
+        dumps(obj)
+        .replace("<", "\\u003c")
+        .replace(">", "\\u003e")
+        .replace("&", "\\u0026")
+        .replace("\u2028", "\\u2028")
+        .replace("\u2029", "\\u2029")
+    )
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_ARRAY_SEP = re.compile(r"[\s,]*")
+_ELEMENT_END = frozenset(",] \t\r\n")
+_decoder = json.JSONDecoder()
+
+
+def _text_after_key(chunks: Iterable[Union[str, bytes]], key: str) -> Iterator[str]:
+    """Decoded text following the first `"key":` in the stream (nothing if absent)."""
+    marker = re.compile(r'"%s"\s*:' % re.escape(key))
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    it = iter(chunks)
+    buf = ""
+    for chunk in it:
+        buf += utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        m = marker.search(buf)
+        if m:
+            yield buf[m.end():]
+            break
+        buf = buf[-(len(key) + 64):]  # a marker may straddle chunks
+    else:
+        return
+    for chunk in it:
+        yield utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+
+def iter_json_array(chunks: Iterable[Union[str, bytes]], key: str = None) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array as its text arrives.
+
+    Only one element is held in memory at a time, so large API responses can
+    be filtered without materializing the whole document. Raises ValueError
+    if the document is not an array.
+
+    With `key`, the array is the value of the first `"key":` member found in
+    the stream (e.g. "records" in a CKAN envelope); a document without that
+    member yields nothing.
+    """
+    if key is not None:
+        chunks = _text_after_key(chunks, key)
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    opened = False
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk)
+        buf = buf[pos:] + chunk
+        pos = 0
+        while True:
+            pos = _ARRAY_SEP.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            if not opened:
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                opened = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # element is split across chunks
+            if end == len(buf) or buf[end] not in _ELEMENT_END:
+                break  # a bare number ("12", "2.") may continue in the next chunk
+            yield obj
+            pos = end
+    # Stream ended: whatever is left must be complete
+    pos = _ARRAY_SEP.match(buf, pos).end()
+    while pos < len(buf) and buf[pos] != "]":
+        obj, pos = _decoder.raw_decode(buf, pos)
+        yield obj
+        pos = _ARRAY_SEP.match(buf, pos).end()
@@ -1,25 +1,48 @@
 """Input validation and normalization for EireScope."""
 import re
 import socket
+import functools
 from typing import Tuple, Optional
 from eirescope.core.entity import EntityType
 
+# Phone separators: "-", "(", ")" and every character regex \s matches (the
+# str.isspace() set), deleted in one str.translate pass
+_PHONE_SEPARATORS = str.maketrans("", "", (
+    "-()\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680"
+    "\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a"
+    "\u2028\u2029\u202f\u205f\u3000"
+))
+
+
+def _phone_digits(value: str) -> Optional[str]:
+    """The 7-15 digits of a phone number (separators and one leading "+"
+    dropped), or None if the value is not one."""
+    cleaned = value.translate(_PHONE_SEPARATORS)
+    digits = cleaned[1:] if cleaned.startswith("+") else cleaned
+    return digits if 7 <= len(digits) <= 15 and digits.isdecimal() else None
+
+
+# Per-type normalization of an already stripped value
+_NORMALIZERS = {
+    EntityType.EMAIL: str.lower,
+    EntityType.DOMAIN: lambda v: v.lower().rstrip("."),
+    EntityType.PHONE: lambda v: v.translate(_PHONE_SEPARATORS),
+    EntityType.USERNAME: lambda v: v.lstrip("@"),
+}
+
 
 class EntityValidator:
     """Validates and normalizes user-provided search inputs."""
 
+    # ASCII-only character classes; re.ASCII skips Unicode handling in the engine
     EMAIL_RE = re.compile(
-        r"^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$"
+        r"^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$", re.ASCII
     )
-    USERNAME_RE = re.compile(r"^[a-zA-Z0-9._\-]{1,64}$")
-    PHONE_RE = re.compile(r"^\+?[\d\s\-\(\)]{7,20}$")
+    USERNAME_RE = re.compile(r"^[a-zA-Z0-9._\-]{1,64}$", re.ASCII)
     DOMAIN_RE = re.compile(
         r"^(?:[a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)+"
-        r"[a-zA-Z]{2,}$"
-    )
-    IP_V4_RE = re.compile(
-        r"^(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}"
-        r"(?:25[0-5]|2[0-4]\d|[01]?\d\d?)$"
+        r"[a-zA-Z]{2,}$",
+        re.ASCII,
     )
 
     @classmethod
@@ -32,8 +55,7 @@ class EntityValidator:
 
     @classmethod
     def validate_phone(cls, value: str) -> bool:
-        cleaned = re.sub(r"[\s\-\(\)]", "", value.strip())
-        return bool(re.match(r"^\+?\d{7,15}$", cleaned))
+        return _phone_digits(value.strip()) is not None
 
     @classmethod
     def validate_domain(cls, value: str) -> bool:
@@ -42,57 +64,52 @@ class EntityValidator:
     @classmethod
     def validate_ip(cls, value: str) -> bool:
         v = value.strip()
-        if cls.IP_V4_RE.match(v):
-            return True
+        # Every address has a colon or three dots; skip the parse otherwise
+        if ":" in v:
+            family = socket.AF_INET6
+        elif v.count(".") == 3:
+            family = socket.AF_INET
+        else:
+            return False
         try:
-            socket.inet_pton(socket.AF_INET6, v)
+            socket.inet_pton(family, v)
             return True
-        except (socket.error, OSError):
+        except (OSError, ValueError):
             return False
 
     @classmethod
     def normalize(cls, value: str, entity_type: EntityType) -> str:
         """Normalize input based on entity type."""
         v = value.strip()
-        if entity_type == EntityType.EMAIL:
-            return v.lower()
-        if entity_type == EntityType.DOMAIN:
-            return v.lower().rstrip(".")
-        if entity_type == EntityType.PHONE:
-            return re.sub(r"[\s\-\(\)]", "", v)
-        if entity_type == EntityType.IP_ADDRESS:
-            return v
-        if entity_type == EntityType.USERNAME:
-            return v.lstrip("@")
-        return v
+        normalizer = _NORMALIZERS.get(entity_type)
+        return normalizer(v) if normalizer else v
 
+    # Pure functions of their string input, so repeated queries are memoized
     @classmethod
+    @functools.lru_cache(maxsize=4096)
     def detect_type(cls, value: str) -> Optional[EntityType]:
         """Auto-detect entity type from input value."""
         v = value.strip()
-        if cls.validate_email(v):
-            return EntityType.EMAIL
+        # "@" is only legal in emails, and domains need a dot: route on those
+        # characters before running any pattern
+        if "@" in v:
+            return EntityType.EMAIL if cls.validate_email(v) else None
         if cls.validate_ip(v):
             return EntityType.IP_ADDRESS
-        if cls.validate_phone(v) and (v.startswith("+") or len(re.sub(r"\D", "", v)) >= 10):
+        digits = _phone_digits(v)
+        if digits is not None and (v.startswith("+") or len(digits) >= 10):
             return EntityType.PHONE
-        if cls.validate_domain(v):
+        if "." in v and cls.validate_domain(v):
             return EntityType.DOMAIN
         if cls.validate_username(v):
             return EntityType.USERNAME
         return None
 
     @classmethod
+    @functools.lru_cache(maxsize=4096)
     def validate_and_normalize(cls, value: str, entity_type: EntityType) -> Tuple[bool, str]:
         """Validate and normalize input. Returns (is_valid, normalized_value)."""
-        validators = {
-            EntityType.EMAIL: cls.validate_email,
-            EntityType.USERNAME: cls.validate_username,
-            EntityType.PHONE: cls.validate_phone,
-            EntityType.DOMAIN: cls.validate_domain,
-            EntityType.IP_ADDRESS: cls.validate_ip,
-        }
-        validator = validators.get(entity_type)
+        validator = _VALIDATORS.get(entity_type)
         if validator and not validator(value):
             return False, value
         # COMPANY and PERSON accept free-text — just require non-empty
@@ -102,3 +119,13 @@ class EntityValidator:
                 return False, value
             return True, v
         return True, cls.normalize(value, entity_type)
+
+
+# Per-type validators, bound once instead of rebuilt on every call
+_VALIDATORS = {
+    EntityType.EMAIL: EntityValidator.validate_email,
+    EntityType.USERNAME: EntityValidator.validate_username,
+    EntityType.PHONE: EntityValidator.validate_phone,
+    EntityType.DOMAIN: EntityValidator.validate_domain,
+    EntityType.IP_ADDRESS: EntityValidator.validate_ip,
+}
@@ -0,0 +1,115 @@
+"""Minimal native WHOIS client (RFC 3912) — no dependency on the `whois` binary.
+
+Domains are resolved in up to three hops: IANA for the TLD's registry server
+(cached per TLD), the registry itself, and — for thin registries such as
+.com/.net — the registrar server the registry points to. IP addresses go
+IANA -> RIR (cached per IPv4 /8), following an ARIN ReferralServer if given.
+"""
+import re
+import socket
+import logging
+import threading
+import ipaddress
+from typing import Dict, Optional
+
+logger = logging.getLogger("eirescope.whois")
+
+IANA_SERVER = "whois.iana.org"
+WHOIS_PORT = 43
+MAX_RESPONSE_BYTES = 1 << 20
+
+_REFER_RX = re.compile(r"^\s*(?:refer|whois):\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_REGISTRAR_SERVER_RX = re.compile(r"^\s*Registrar WHOIS Server:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_REFERRAL_SERVER_RX = re.compile(r"^\s*ReferralServer:\s*whois://([^\s:/]+)", re.IGNORECASE | re.MULTILINE)
+
+# TLD -> registry WHOIS server; seeded with common TLDs, filled from IANA referrals
+_tld_servers: Dict[str, str] = {
+    "com": "whois.verisign-grs.com",
+    "net": "whois.verisign-grs.com",
+    "org": "whois.publicinterestregistry.org",
+    "ie": "whois.weare.ie",
+    "io": "whois.nic.io",
+    "uk": "whois.nic.uk",
+}
+_tld_lock = threading.Lock()
+
+# First IPv4 octet -> RIR WHOIS server (IANA delegates IPv4 space by /8)
+_ipv4_servers: Dict[str, str] = {}
+
+
+def query(server: str, text: str, timeout: float = 10) -> str:
+    """Send one WHOIS query and return the full response."""
+    chunks = []
+    received = 0
+    with socket.create_connection((server, WHOIS_PORT), timeout=timeout) as sock:
+        sock.sendall(text.encode("utf-8") + b"\r\n")
+        while received < MAX_RESPONSE_BYTES:
+            data = sock.recv(65536)
+            if not data:
+                break
+            chunks.append(data)
+            received += len(data)
+    return b"".join(chunks).decode("utf-8", "replace")
+
+
+def registry_server(tld: str, timeout: float = 10) -> Optional[str]:
+    """WHOIS server for a TLD, asking IANA once per TLD."""
+    tld = tld.lower()
+    with _tld_lock:
+        server = _tld_servers.get(tld)
+    if server:
+        return server
+    m = _REFER_RX.search(query(IANA_SERVER, tld, timeout))
+    if not m:
+        return None
+    server = m.group(1).lower()
+    with _tld_lock:
+        _tld_servers[tld] = server
+    return server
+
+
+def lookup_domain(domain: str, timeout: float = 10) -> Optional[str]:
+    """Raw WHOIS text for a domain (registry + registrar responses), or None."""
+    domain = domain.lower().rstrip(".")
+    server = registry_server(domain.rsplit(".", 1)[-1], timeout)
+    if not server:
+        return None
+    raw = query(server, domain, timeout)
+
+    # Thin registries only hold a pointer to the registrar's WHOIS server
+    m = _REGISTRAR_SERVER_RX.search(raw)
+    if m:
+        registrar = m.group(1).lower()
+        registrar = registrar.split("://", 1)[-1].rstrip("/")
+        if registrar and registrar != server:
+            try:
+                raw += "\n" + query(registrar, domain, timeout)
+            except OSError as e:
+                logger.debug(f"Registrar WHOIS {registrar} failed for {domain}: {e}")
+    return raw
+
+
+def lookup_ip(ip: str, timeout: float = 10) -> Optional[str]:
+    """Raw WHOIS text for an IP address from its RIR, or None."""
+    addr = ipaddress.ip_address(ip)
+    octet = str(addr).split(".", 1)[0] if addr.version == 4 else None
+    with _tld_lock:
+        server = _ipv4_servers.get(octet) if octet else None
+    if not server:
+        m = _REFER_RX.search(query(IANA_SERVER, str(addr), timeout))
+        if not m:
+            return None
+        server = m.group(1).lower()
+        if octet:
+            with _tld_lock:
+                _ipv4_servers[octet] = server
+    raw = query(server, str(addr), timeout)
+
+    # ARIN answers for space transferred to another RIR with a referral
+    m = _REFERRAL_SERVER_RX.search(raw)
+    if m and m.group(1).lower() != server:
+        try:
+            raw = query(m.group(1).lower(), str(addr), timeout)
+        except OSError as e:
+            logger.debug(f"Referred WHOIS {m.group(1)} failed for {ip}: {e}")
+    return raw
@@ -1,21 +1,25 @@
 """EireScope Web Server — Lightweight HTTP server with Jinja2 templates."""
 import os
 import sys
-import json
+import stat
 import logging
 import mimetypes
 import urllib.parse
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from jinja2 import Environment, FileSystemLoader
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 
 # Add project root to path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from config import Config
 from eirescope.core.engine import InvestigationEngine
 from eirescope.core.results import summarize_investigation
 from eirescope.db.database import Database
+from eirescope.reporting.report_generator import ReportGenerator
+from eirescope.utils import serialization
+from eirescope.utils.cache import TTLCache
 
 logger = logging.getLogger("eirescope.web")
 
@@ -29,28 +33,78 @@ DATA_DIR = os.path.join(os.path.dirname(WEB_DIR), "data")
 jinja_env = Environment(
     loader=FileSystemLoader(TEMPLATE_DIR),
     autoescape=True,
+    auto_reload=False,
 )
 
 # Umami Analytics — inject website ID into all templates
 jinja_env.globals["umami_website_id"] = os.getenv("EIRESCOPE_UMAMI_WEBSITE_ID", "")
 
+# Page templates, compiled once at startup instead of looked up per request
+TEMPLATES = {}
+for _name in ("index.html", "investigation.html", "history.html", "error.html"):
+    try:
+        TEMPLATES[_name] = jinja_env.get_template(_name)
+    except TemplateNotFound:
+        logger.warning(f"Template {_name} not found in {TEMPLATE_DIR}")
+del _name
+
+
+def _template(name: str):
+    template = TEMPLATES.get(name)
+    return template if template is not None else jinja_env.get_template(name)
+
 # Initialize core components — always use /tmp for SQLite (avoids filesystem restrictions)
 import tempfile
 _db_path = os.path.join(tempfile.gettempdir(), "eirescope_investigations.db")
 db = Database(_db_path)
-engine = InvestigationEngine()
+engine = InvestigationEngine(config=Config.as_dict())
+report_generator = ReportGenerator()
+
+# The module list is fixed once the engine has loaded its plugins
+_MODULES = engine.get_available_modules()
+_SUPPORTED_TYPES = engine.get_supported_types()
+_MODULES_JSON = serialization.dumps_bytes(_MODULES, default=str)
+
+# Summaries of stored investigations by id. Investigations are only written
+# through _save_investigation() in this process, which refreshes the entry.
+_summary_cache = TTLCache(maxsize=256, ttl=3600)
+
+
+def _save_investigation(investigation) -> dict:
+    """Persist an investigation and return its (cached) summary."""
+    db.save_investigation(investigation)
+    summary = summarize_investigation(investigation)
+    _summary_cache.set(investigation.id, summary)
+    return summary
+
+
+def _load_summary(inv_id: str):
+    """Summary of a stored investigation, or None if there is no such id."""
+    summary = _summary_cache.get(inv_id)
+    if summary is None:
+        investigation = db.load_investigation(inv_id)
+        if investigation is None:
+            return None
+        summary = summarize_investigation(investigation)
+        _summary_cache.set(inv_id, summary)
+    return summary
 
 
 class EireScopeHandler(BaseHTTPRequestHandler):
     """HTTP Request handler for EireScope web interface."""
 
+    # Keep-alive: every response must carry a Content-Length
+    protocol_version = "HTTP/1.1"
+    # Socket timeout (seconds): idle keep-alive connections are closed instead
+    # of holding a handler thread blocked in readline() forever
+    timeout = 30
+
     def log_message(self, format, *args):
         logger.info(f"{self.client_address[0]} - {format % args}")
 
     def do_GET(self):
         parsed = urllib.parse.urlparse(self.path)
         path = parsed.path
-        query = urllib.parse.parse_qs(parsed.query)
 
         # Static files
         if path.startswith("/static/"):
@@ -66,7 +120,7 @@ class EireScopeHandler(BaseHTTPRequestHandler):
         elif path == "/history":
             self._handle_history()
         elif path == "/api/modules":
-            self._json_response(engine.get_available_modules())
+            self._json_bytes_response(_MODULES_JSON)
         elif path.startswith("/api/investigation/"):
             inv_id = path.split("/api/investigation/")[1].strip("/")
             self._handle_api_investigation(inv_id)
@@ -87,17 +141,17 @@ class EireScopeHandler(BaseHTTPRequestHandler):
         elif path == "/search":
             self._handle_search_form()
         else:
-            self._send_error(404, "Endpoint not found")
+            # The body is left unread, so the connection cannot be reused
+            self._send_error(404, "Endpoint not found", headers={"Connection": "close"})
 
     def _handle_index(self):
         """Render the search landing page."""
-        modules = engine.get_available_modules()
         recent = db.list_investigations(limit=10)
-        template = jinja_env.get_template("index.html")
+        template = _template("index.html")
         html = template.render(
-            modules=modules,
+            modules=_MODULES,
             recent_investigations=recent,
-            supported_types=engine.get_supported_types(),
+            supported_types=_SUPPORTED_TYPES,
         )
         self._html_response(html)
 
@@ -105,10 +159,14 @@ class EireScopeHandler(BaseHTTPRequestHandler):
         """Handle form-based search submission."""
         content_length = int(self.headers.get("Content-Length", 0))
         body = self.rfile.read(content_length).decode("utf-8")
-        params = urllib.parse.parse_qs(body)
+        try:
+            params = dict(urllib.parse.parse_qsl(body, keep_blank_values=True, max_num_fields=10))
+        except ValueError:
+            self._send_error(400, "Too many form fields")
+            return
 
-        query = params.get("query", [""])[0].strip()
-        entity_type = params.get("entity_type", [None])[0]
+        query = params.get("query", "").strip()
+        entity_type = params.get("entity_type")
         if entity_type == "auto":
             entity_type = None
 
@@ -118,16 +176,16 @@ class EireScopeHandler(BaseHTTPRequestHandler):
 
         try:
             investigation = engine.investigate(query, entity_type)
-            db.save_investigation(investigation)
+            _save_investigation(investigation)
             self._redirect(f"/investigation/{investigation.id}")
         except Exception as e:
             logger.error(f"Search failed: {e}")
-            template = jinja_env.get_template("index.html")
+            template = _template("index.html")
             html = template.render(
                 error=str(e),
-                modules=engine.get_available_modules(),
+                modules=_MODULES,
                 recent_investigations=db.list_investigations(limit=10),
-                supported_types=engine.get_supported_types(),
+                supported_types=_SUPPORTED_TYPES,
                 query=query,
             )
             self._html_response(html)
@@ -135,7 +193,7 @@ class EireScopeHandler(BaseHTTPRequestHandler):
     def _handle_search(self):
         """Handle API search (JSON)."""
         content_length = int(self.headers.get("Content-Length", 0))
-        body = json.loads(self.rfile.read(content_length).decode("utf-8"))
+        body = serialization.loads(self.rfile.read(content_length))
 
         query = body.get("query", "").strip()
         entity_type = body.get("entity_type")
@@ -147,83 +205,96 @@ class EireScopeHandler(BaseHTTPRequestHandler):
 
         try:
             investigation = engine.investigate(query, entity_type, module_filter)
-            db.save_investigation(investigation)
-            summary = summarize_investigation(investigation)
-            self._json_response(summary)
+            self._json_response(_save_investigation(investigation))
         except Exception as e:
             self._json_response({"error": str(e)}, status=400)
 
     def _handle_investigation(self, inv_id: str):
         """Render investigation results page."""
-        investigation = db.load_investigation(inv_id)
-        if not investigation:
+        summary = _load_summary(inv_id)
+        if not summary:
             self._send_error(404, "Investigation not found")
             return
 
-        summary = summarize_investigation(investigation)
-        template = jinja_env.get_template("investigation.html")
-        html = template.render(inv=summary, json_data=json.dumps(summary))
+        template = _template("investigation.html")
+        html = template.render(inv=summary, json_data=serialization.dumps_html(summary))
         self._html_response(html)
 
     def _handle_api_investigation(self, inv_id: str):
         """Return investigation data as JSON."""
-        investigation = db.load_investigation(inv_id)
-        if not investigation:
+        summary = _load_summary(inv_id)
+        if not summary:
             self._json_response({"error": "Not found"}, status=404)
             return
-        self._json_response(summarize_investigation(investigation))
+        self._json_response(summary)
 
     def _handle_history(self):
         """Render investigation history page."""
         investigations = db.list_investigations(limit=50)
-        template = jinja_env.get_template("history.html")
+        template = _template("history.html")
         html = template.render(investigations=investigations)
         self._html_response(html)
 
     def _handle_export(self, inv_id: str):
         """Export investigation as HTML report."""
-        investigation = db.load_investigation(inv_id)
-        if not investigation:
+        summary = _load_summary(inv_id)
+        if not summary:
             self._send_error(404, "Investigation not found")
             return
 
-        summary = summarize_investigation(investigation)
-        report_template_path = os.path.join(
-            os.path.dirname(WEB_DIR), "reporting", "templates", "report.html"
-        )
-        if os.path.exists(report_template_path):
-            report_env = Environment(
-                loader=FileSystemLoader(os.path.dirname(report_template_path)),
-                autoescape=True,
-            )
-            template = report_env.get_template("report.html")
-        else:
-            template = jinja_env.get_template("report.html")
-
-        html = template.render(inv=summary, json_data=json.dumps(summary))
+        html = report_generator.render_summary(summary)
         self._html_response(html, headers={
             "Content-Disposition": f'attachment; filename="eirescope-report-{inv_id[:8]}.html"'
         })
 
     def _serve_static(self, filepath: str):
-        """Serve static files (CSS, JS, images)."""
+        """Serve static files (CSS, JS, images).
+
+        Answers If-None-Match with 304, prefers a pre-compressed `<file>.gz`
+        sibling for gzip-capable clients and hands the body to sendfile().
+        """
         full_path = os.path.join(STATIC_DIR, filepath)
-        if not os.path.isfile(full_path):
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             self._send_error(404, "File not found")
             return
 
         mime_type, _ = mimetypes.guess_type(full_path)
         mime_type = mime_type or "application/octet-stream"
 
-        with open(full_path, "rb") as f:
-            content = f.read()
+        encoding = None
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            try:
+                gz = os.stat(full_path + ".gz")
+                if stat.S_ISREG(gz.st_mode):
+                    full_path, st, encoding = full_path + ".gz", gz, "gzip"
+            except OSError:
+                pass
+
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-gz" if encoding else ""}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "public, max-age=3600")
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
 
-        self.send_response(200)
-        self.send_header("Content-Type", mime_type)
-        self.send_header("Content-Length", str(len(content)))
-        self.send_header("Cache-Control", "public, max-age=3600")
-        self.end_headers()
-        self.wfile.write(content)
+        with open(full_path, "rb") as f:
+            self.send_response(200)
+            self.send_header("Content-Type", mime_type)
+            self.send_header("Content-Length", str(st.st_size))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "public, max-age=3600")
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            self.wfile.flush()
+            self.connection.sendfile(f)
 
     def _html_response(self, html: str, status: int = 200, headers: dict = None):
         content = html.encode("utf-8")
@@ -237,7 +308,9 @@ class EireScopeHandler(BaseHTTPRequestHandler):
         self.wfile.write(content)
 
     def _json_response(self, data, status: int = 200):
-        content = json.dumps(data, indent=2, default=str).encode("utf-8")
+        self._json_bytes_response(serialization.dumps_bytes(data, default=str), status)
+
+    def _json_bytes_response(self, content: bytes, status: int = 200):
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(content)))
@@ -247,20 +320,22 @@ class EireScopeHandler(BaseHTTPRequestHandler):
     def _redirect(self, location: str):
         self.send_response(302)
         self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
-    def _send_error(self, code: int, message: str):
+    def _send_error(self, code: int, message: str, headers: dict = None):
         try:
-            template = jinja_env.get_template("error.html")
+            template = _template("error.html")
             html = template.render(code=code, message=message)
-            self._html_response(html, status=code)
+            self._html_response(html, status=code, headers=headers)
         except Exception:
-            self._html_response(f"<h1>{code}</h1><p>{message}</p>", status=code)
+            self._html_response(f"<h1>{code}</h1><p>{message}</p>", status=code, headers=headers)
 
 
-def create_server(host: str = "0.0.0.0", port: int = 5000) -> HTTPServer:
-    """Create and return the EireScope HTTP server."""
-    server = HTTPServer((host, port), EireScopeHandler)
+def create_server(host: str = "0.0.0.0", port: int = 5000) -> ThreadingHTTPServer:
+    """Create and return the EireScope HTTP server (one thread per connection)."""
+    server = ThreadingHTTPServer((host, port), EireScopeHandler)
+    server.daemon_threads = True
     logger.info(f"EireScope server ready at http://{host}:{port}")
     return server
 